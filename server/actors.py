@@ -0,0 +1,23 @@
+# Curated pool the daily and random puzzles draw from
+actors = [
+    "Scarlett Johansson", "Robert Downey Jr.", "Zoe Saldaña", "Chris Pratt",
+    "Tom Cruise", "Chris Hemsworth", "Vin Diesel", "Dwayne Johnson", "Bradley Cooper",
+    "Chris Evans", "Tom Hanks", "Johnny Depp", "Tom Holland", "Mark Ruffalo",
+    "Emma Watson", "Will Smith", "Don Cheadle", "Dave Bautista", "Jeremy Renner",
+    "Harrison Ford", "Daniel Radcliffe", "Rachel Sennott", "Elizabeth Olsen",
+    "Steve Carell", "Benedict Cumberbatch", "Jack Black", "Dove Cameron", "Hugh Jackman",
+    "Chadwick Boseman", "Amanda Seyfried", "Sebastian Stan", "Leonardo DiCaprio", "Matt Damon",
+    "Sofia Carson", "Tom Hiddleston", "Brad Pitt", "Paul Bettany", "Angelina Jolie",
+    "Eddie Murphy", "Ryan Reynolds", "Kristen Bell", "Ted Danson", "Mckenna Grace",
+    "Nicole Kidman", "Ben Stiller", "Jason Statham", "Nicolas Cage", "Aubrey Plaza",
+    "Jim Carrey", "Idris Elba", "Gwyneth Paltrow", "Mark Wahlberg", "Jennifer Lawrence",
+    "Rachel McAdams", "Christian Bale", "Cameron Diaz", "Keanu Reeves", "Natalie Portman",
+    "Paul Rudd", "Josh Gad", "Julia Roberts", "Brie Larson", "Sandra Bullock",
+    "Martin Freeman", "Adam Sandler", "Ben Affleck", "Helena Bonham Carter", "Ralph Fiennes",
+    "Sylvester Stallone", "Lupita Nyong'o", "Owen Wilson", "Adam Driver", "Michelle Rodriguez",
+    "Denzel Washington", "George Clooney", "Daniel Craig", "Orlando Bloom", "Daisy Ridley",
+    "Morgan Freeman", "Robert Pattinson", "Robin Williams", "Jesse Eisenberg", "Anthony Mackie",
+    "Will Ferrell", "Kevin Hart", "Mel Gibson", "Steven Yeun", "Seth Rogen",
+    "Anna Kendrick", "Shia LaBeouf", "Margot Robbie", "Jason Momoa", "Emma Stone",
+    "Meryl Streep", "Blake Lively", "Reece Witherspoon", "Channing Tatum"
+]
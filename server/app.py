@@ -1,55 +1,83 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
-import requests
 import random
 import os
 import json
-import base64
-from datetime import datetime, date
-import pytz
-import firebase_admin
-from firebase_admin import credentials, db
+import time
+import metrics
+from tmdb import client as tmdb, image_url
+from actors import actors
+from graph import CoStarGraph, GRAPH_PATH
+from validation import LinkValidator
+from daily import DailySnapshot, seconds_until_rollover
+from leaderboard import Leaderboard, StoreUnavailable, store_from_env
+from suggest_index import SuggestIndex
+
+# Seconds /get-easy-options may spend on TMDB before answering with what it has
+EASY_OPTIONS_DEADLINE = float(os.getenv("EASY_OPTIONS_DEADLINE", 8))
+
+# Offline-built co-star graph (see graph.py); hints fall back to live TMDB without it
+co_star_graph = CoStarGraph.load(GRAPH_PATH) if os.path.exists(GRAPH_PATH) else None
+link_validator = LinkValidator(tmdb)
+
+# Autocomplete answers from here first; every TMDB response we fetch feeds it
+SUGGEST_LIMIT = int(os.getenv("SUGGEST_LIMIT", 10))
+SUGGEST_MIN_HITS = int(os.getenv("SUGGEST_MIN_HITS", 5))
+
+def build_suggest_index():
+    index = SuggestIndex()
+    index.seed("actor", ((name, None, 0, True) for name in actors))
+    if co_star_graph is not None:
+        index.seed("actor", ((a[1], image_url(a[2]), a[3], False) for a in co_star_graph.actors))
+        index.seed("title", ((t[2], image_url(t[4]), t[3], False) for t in co_star_graph.titles))
+    tmdb.observers.append(index.harvest)
+    return index
+
+suggest_index = build_suggest_index()
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {
     "origins": [
         "http://localhost:3000",
         "https://screenlink-game-rohan-ranes-projects.vercel.app"
-    ]
+    ],
+    "expose_headers": ["X-Optimal-Steps"]
 }})
 
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-
-# 🔐 Load Firebase credentials from environment variable
-key_b64 = os.getenv("FIREBASE_CRED_B64")
-key_json = json.loads(base64.b64decode(key_b64))
-cred = credentials.Certificate(key_json)
-firebase_admin.initialize_app(cred, {
-    'databaseURL': 'https://screen-link-2025-default-rtdb.firebaseio.com/'  # <-- replace this
-})
-
-actors = [  # (unchanged actor list)
-    "Scarlett Johansson", "Robert Downey Jr.", "Zoe Saldaña", "Chris Pratt",
-    "Tom Cruise", "Chris Hemsworth", "Vin Diesel", "Dwayne Johnson", "Bradley Cooper",
-    "Chris Evans", "Tom Hanks", "Johnny Depp", "Tom Holland", "Mark Ruffalo",
-    "Emma Watson", "Will Smith", "Don Cheadle", "Dave Bautista", "Jeremy Renner",
-    "Harrison Ford", "Daniel Radcliffe", "Rachel Sennott", "Elizabeth Olsen",
-    "Steve Carell", "Benedict Cumberbatch", "Jack Black", "Dove Cameron", "Hugh Jackman",
-    "Chadwick Boseman", "Amanda Seyfried", "Sebastian Stan", "Leonardo DiCaprio", "Matt Damon",
-    "Sofia Carson", "Tom Hiddleston", "Brad Pitt", "Paul Bettany", "Angelina Jolie",
-    "Eddie Murphy", "Ryan Reynolds", "Kristen Bell", "Ted Danson", "Mckenna Grace",
-    "Nicole Kidman", "Ben Stiller", "Jason Statham", "Nicolas Cage", "Aubrey Plaza",
-    "Jim Carrey", "Idris Elba", "Gwyneth Paltrow", "Mark Wahlberg", "Jennifer Lawrence",
-    "Rachel McAdams", "Christian Bale", "Cameron Diaz", "Keanu Reeves", "Natalie Portman",
-    "Paul Rudd", "Josh Gad", "Julia Roberts", "Brie Larson", "Sandra Bullock",
-    "Martin Freeman", "Adam Sandler", "Ben Affleck", "Helena Bonham Carter", "Ralph Fiennes",
-    "Sylvester Stallone", "Lupita Nyong'o", "Owen Wilson", "Adam Driver", "Michelle Rodriguez",
-    "Denzel Washington", "George Clooney", "Daniel Craig", "Orlando Bloom", "Daisy Ridley",
-    "Morgan Freeman", "Robert Pattinson", "Robin Williams", "Jesse Eisenberg", "Anthony Mackie",
-    "Will Ferrell", "Kevin Hart", "Mel Gibson", "Steven Yeun", "Seth Rogen",
-    "Anna Kendrick", "Shia LaBeouf", "Margot Robbie", "Jason Momoa", "Emma Stone",
-    "Meryl Streep", "Blake Lively", "Reece Witherspoon", "Channing Tatum"
-]
+# LEADERBOARD_BACKEND=json keeps scores in a local file, e.g. for load tests.
+# Firebase itself is only initialized on the first leaderboard request.
+store = store_from_env()
+leaderboard = Leaderboard(store, refresh_interval=float(os.getenv("LEADERBOARD_REFRESH", 5)))
+
+# Opt-in: log the upstream call breakdown of any request slower than this
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 0))
+
+@app.before_request
+def start_request_trace():
+    g.started = time.perf_counter()
+    g.trace = metrics.start_trace()
+
+@app.after_request
+def finish_request_trace(response):
+    elapsed = time.perf_counter() - g.started
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.request_seconds.observe(elapsed, route=route, method=request.method, status=str(response.status_code))
+
+    # Summed per service, so concurrent calls can add up to more than the total
+    timings = [f"total;dur={elapsed * 1000:.1f}"]
+    for service in sorted({call["service"] for call in g.trace}):
+        calls = [call for call in g.trace if call["service"] == service]
+        upstream = sum(1 for c in calls if c["cache"] in ("miss", "none"))
+        timings.append(f'{service};dur={sum(c["ms"] for c in calls):.1f};desc="{len(calls)} calls, {upstream} upstream"')
+    response.headers["Server-Timing"] = ", ".join(timings)
+
+    if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+        app.logger.warning(
+            "slow request %s %s took %.0f ms: %s",
+            request.method, request.path, elapsed * 1000, json.dumps(metrics.breakdown(g.trace)),
+        )
+    metrics.end_trace()
+    return response
 
 @app.route("/")
 def index():
@@ -65,21 +93,25 @@ def get_random_actors():
 
 @app.route("/get-daily-actors")
 def get_daily_actors():
-    pacific = pytz.timezone('US/Pacific')
-    today_seed = datetime.now(pacific).strftime("%Y-%m-%d")
-    rng = random.Random(today_seed)
-    selected = rng.sample(actors, 2)
-    return jsonify({
-        "start": get_actor_data(selected[0]),
-        "goal": get_actor_data(selected[1])
-    })
+    # Same puzzle for everyone all day, so this never waits on TMDB once built
+    _, body, etag, complete = daily_snapshot.get()
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    if complete:
+        response.cache_control.public = True
+        response.cache_control.max_age = seconds_until_rollover()
+    else:
+        # An actor lookup failed; the snapshot is rebuilt shortly, so don't let anyone keep this one
+        response.cache_control.no_store = True
+    return response.make_conditional(request)
 
 def get_actor_data(name):
-    url = f"https://api.themoviedb.org/3/search/person?query={name}&api_key={TMDB_API_KEY}"
-    res = requests.get(url).json()
-    result = res.get("results", [{}])[0]
-    image = f"https://image.tmdb.org/t/p/w185{result.get('profile_path')}" if result.get("profile_path") else None
-    return {"name": name, "id": result.get("id"), "image": image}
+    res = tmdb.get("search/person", query=name)
+    result = (res.get("results") or [{}])[0]
+    return {"name": name, "id": result.get("id"), "image": image_url(result.get("profile_path"))}
+
+daily_snapshot = DailySnapshot(actors, get_actor_data, graph=co_star_graph, warm=link_validator.filmography,
+                               rollover=True)
 
 @app.route("/suggest")
 def suggest():
@@ -87,8 +119,14 @@ def suggest():
     type_ = request.args.get("type")
     endpoint = "search/person" if type_ == "actor" else "search/multi"
 
-    url = f"https://api.themoviedb.org/3/{endpoint}?query={query}&api_key={TMDB_API_KEY}"
-    res = requests.get(url).json()
+    # Curated names are seeded without a picture until TMDB returns one, so only
+    # entries with an image are served locally; the client shows one per row
+    local = suggest_index.search("actor" if type_ == "actor" else "title", query, SUGGEST_LIMIT, require_image=True)
+    if len(local) >= SUGGEST_MIN_HITS:
+        return jsonify(local)
+
+    # Too few local hits: ask TMDB (cached by the client, and harvested into the index)
+    res = tmdb.get(endpoint, query=query)
     results = res.get("results", [])
 
     suggestions = []
@@ -97,8 +135,7 @@ def suggest():
         if not name:
             continue
         profile_path = r.get("profile_path") or r.get("poster_path")
-        image = f"https://image.tmdb.org/t/p/w185{profile_path}" if profile_path else None
-        suggestions.append({"name": name, "image": image})
+        suggestions.append({"name": name, "image": image_url(profile_path)})
 
     return jsonify(suggestions)
 
@@ -111,59 +148,92 @@ def get_easy_options():
     if not current_actor or not goal_actor:
         return jsonify([])
 
-    def get_actor_id(name):
-        url = f"https://api.themoviedb.org/3/search/person?query={name}&api_key={TMDB_API_KEY}"
-        res = requests.get(url).json().get("results", [])
-        return res[0]["id"] if res else None
-
-    def get_credits(actor_id):
-        movies = requests.get(
-            f"https://api.themoviedb.org/3/person/{actor_id}/movie_credits?api_key={TMDB_API_KEY}"
-        ).json().get("cast", [])
-        tv = requests.get(
-            f"https://api.themoviedb.org/3/person/{actor_id}/tv_credits?api_key={TMDB_API_KEY}"
-        ).json().get("cast", [])
+    if co_star_graph is not None:
+        steps, links = co_star_graph.next_links(current_actor, goal_actor)
+        if links:
+            response = jsonify(graph_suggestions(current_actor, links))
+            response.headers["X-Optimal-Steps"] = str(steps)
+            return response
+
+    # Everything below fans out on the TMDB pool; whatever isn't back by the
+    # deadline is left out rather than guessed at.
+    deadline = time.monotonic() + EASY_OPTIONS_DEADLINE
+
+    def content_type(credit):
+        return "movie" if "title" in credit else "tv"
+
+    def get_actor_ids(*names):
+        pages = tmdb.get_many([("search/person", {"query": n}) for n in names], deadline=deadline)
+        ids = []
+        for page in pages:
+            results = (page or {}).get("results") or []
+            ids.append(results[0]["id"] if results else None)
+        return ids
+
+    def get_credits(*actor_ids):
+        lookups = []
+        for actor_id in actor_ids:
+            lookups.append((f"person/{actor_id}/movie_credits", {}))
+            lookups.append((f"person/{actor_id}/tv_credits", {}))
+        pages = tmdb.get_many(lookups, deadline=deadline)
+
+        per_actor = []
+        for movies, tv in zip(pages[::2], pages[1::2]):
+            cast = (movies or {}).get("cast", []) + (tv or {}).get("cast", [])
+            per_actor.append([c for c in cast if c.get("title") or c.get("name", "")])
+
+        # One details lookup per distinct title, shared across both actors
+        keys = sorted({(content_type(c), c["id"]) for credits in per_actor for c in credits})
+        pages = tmdb.get_many([(f"{t}/{i}", {}) for t, i in keys], deadline=deadline)
+        details = dict(zip(keys, pages))
 
         filtered = []
-        for credit in movies + tv:
-            title = credit.get("title") or credit.get("name", "")
-            if not title:
-                continue
-            
-            content_type = "movie" if "title" in credit else "tv"
-            details_url = f"https://api.themoviedb.org/3/{content_type}/{credit['id']}?api_key={TMDB_API_KEY}"
-            details = requests.get(details_url).json()
-
-            genres = [g["name"].lower() for g in details.get("genres", [])]
-            if any(bad in genres for bad in ["talk", "news", "reality", "variety"]):
-                continue
-            filtered.append(credit)
-
-        return sorted(filtered, key=lambda x: x.get("popularity", 0), reverse=True)
-
-
-    def get_costars(credit):
-        content_id = credit["id"]
-        content_type = "movie" if "title" in credit else "tv"
-        credit_url = (
-            f"https://api.themoviedb.org/3/{content_type}/{content_id}/credits?api_key={TMDB_API_KEY}"
-        )
-        cast = requests.get(credit_url).json().get("cast", [])
-        return [a.get("name") for a in cast if a.get("name")]
+        for credits in per_actor:
+            kept = []
+            for credit in credits:
+                info = details.get((content_type(credit), credit["id"]))
+                if info is None:
+                    continue  # genre unknown, so we can't vouch for it
+                genres = [g["name"].lower() for g in info.get("genres", [])]
+                if any(bad in genres for bad in ["talk", "news", "reality", "variety"]):
+                    continue
+                kept.append(credit)
+            filtered.append(sorted(kept, key=lambda x: x.get("popularity", 0), reverse=True))
+        return filtered
+
+    def get_costars(credits):
+        keys = [(content_type(c), c["id"]) for c in credits]
+        pages = tmdb.get_many([(f"{t}/{i}/credits", {}) for t, i in keys], deadline=deadline)
+        return {
+            key: [a.get("name") for a in page.get("cast", []) if a.get("name")]
+            for key, page in zip(keys, pages) if page is not None
+        }
 
     # IDs
-    current_id = get_actor_id(current_actor)
-    goal_id = get_actor_id(goal_actor)
+    current_id, goal_id = get_actor_ids(current_actor, goal_actor)
     if not current_id or not goal_id:
         return jsonify([])
 
-    current_credits = get_credits(current_id)
-    goal_credits = get_credits(goal_id)
+    current_credits, goal_credits = get_credits(current_id, goal_id)
+
+    # At most five distinct titles from the current actor make it into the list
+    candidates = []
+    candidate_titles = set()
+    for credit in current_credits:
+        title = credit.get("title") or credit.get("name")
+        if title and title not in candidate_titles:
+            candidates.append(credit)
+            candidate_titles.add(title)
+        if len(candidates) >= 5:
+            break
+
+    goal_sample = goal_credits[:15]  # limit for performance
+    costars = get_costars(goal_sample + candidates)
 
     # Get goal's known co-stars
     goal_costars = set()
-    for credit in goal_credits[:15]:  # limit for performance
-        for name in get_costars(credit):
+    for credit in goal_sample:
+        for name in costars.get((content_type(credit), credit["id"]), []):
             goal_costars.add(name)
 
     suggestions = []
@@ -183,7 +253,7 @@ def get_easy_options():
         added_names.add(title)
 
         # Get co-stars from this credit
-        cast = get_costars(credit)
+        cast = costars.get((content_type(credit), credit["id"]), [])
         for name in cast:
             if name == current_actor or name in added_names:
                 continue
@@ -202,67 +272,48 @@ def get_easy_options():
 
     return jsonify(suggestions[:5])
 
+def graph_suggestions(current_actor, links):
+    # Same title-then-co-star shape as the live hints, but every actor here
+    # is a next hop on a shortest path to the goal
+    suggestions = []
+    added_names = {current_actor}
+    for title, costars in links:
+        if len(suggestions) >= 5:
+            break
+        if title in added_names:
+            continue
+        suggestions.append({"name": title, "type": "title"})
+        added_names.add(title)
+        for name in costars:
+            if name not in added_names:
+                suggestions.append({"name": name, "type": "actor"})
+                added_names.add(name)
+                break
+    return suggestions[:5]
+
 @app.route("/validate-link", methods=["POST"])
 def validate_link():
     data = request.get_json()
-    actor = data.get("actor")
-    title = data.get("title")
-    next_actor = data.get("next_actor")
-
-    url = f"https://api.themoviedb.org/3/search/person?query={actor}&api_key={TMDB_API_KEY}"
-    res = requests.get(url).json()
-    actor_id = res["results"][0]["id"]
-
-    movie_credits = requests.get(
-        f"https://api.themoviedb.org/3/person/{actor_id}/movie_credits?api_key={TMDB_API_KEY}"
-    ).json().get("cast", [])
-
-    tv_credits = requests.get(
-        f"https://api.themoviedb.org/3/person/{actor_id}/tv_credits?api_key={TMDB_API_KEY}"
-    ).json().get("cast", [])
-
-    cast = movie_credits + tv_credits
-
-    for m in cast:
-        content_id = m["id"]
-        content_name = m.get("title") or m.get("name")
-        content_type = "movie" if "title" in m else "tv"
-
-        if content_name and title:
-            if content_name.lower() not in title.lower() and title.lower() not in content_name.lower():
-                continue
-        else:
-            continue
-
-        if content_type == "tv":
-            credits_url = f"https://api.themoviedb.org/3/tv/{content_id}/aggregate_credits?api_key={TMDB_API_KEY}"
-            credits = requests.get(credits_url).json()
-            cast_list = credits.get("cast", [])
-            for a in cast_list:
-                name = a.get("name") or a.get("original_name")
-                if name and name.strip().lower() == next_actor.strip().lower():
-                    actor_image = a.get("profile_path")
-                    poster = m.get("poster_path")
-                    return jsonify({
-                        "valid": True,
-                        "actor_image": f"https://image.tmdb.org/t/p/w185{actor_image}" if actor_image else None,
-                        "poster": f"https://image.tmdb.org/t/p/w185{poster}" if poster else None
-                    })
-        else:
-            credits_url = f"https://api.themoviedb.org/3/movie/{content_id}/credits?api_key={TMDB_API_KEY}"
-            credits = requests.get(credits_url).json()
-            cast_list = credits.get("cast", [])
-            for a in cast_list:
-                if a["name"].strip().lower() == next_actor.strip().lower():
-                    actor_image = a.get("profile_path")
-                    poster = m.get("poster_path")
-                    return jsonify({
-                        "valid": True,
-                        "actor_image": f"https://image.tmdb.org/t/p/w185{actor_image}" if actor_image else None,
-                        "poster": f"https://image.tmdb.org/t/p/w185{poster}" if poster else None
-                    })
-
-    return jsonify({"valid": False})
+    return jsonify(link_validator.validate(data.get("actor"), data.get("title"), data.get("next_actor")))
+
+# TMDB client stats as (kind, help); the counters only ever grow
+TMDB_STATS = {
+    "hits": ("counter", "Lookups answered from the response cache."),
+    "misses": ("counter", "Lookups that led an upstream fetch."),
+    "coalesced": ("counter", "Lookups that waited on another caller's fetch."),
+    "upstream_calls": ("counter", "Requests sent to TMDB."),
+    "cache_size": ("gauge", "Responses currently cached."),
+    "inflight": ("gauge", "Upstream fetches in progress."),
+}
+
+@app.route("/metrics")
+def metrics_endpoint():
+    stats = tmdb.stats()
+    extra = []
+    for key, (kind, help) in TMDB_STATS.items():
+        name = f"screenlink_tmdb_{key}" + ("_total" if kind == "counter" else "")
+        extra += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return metrics.render(extra), 200, {"Content-Type": "text/plain; version=0.0.4"}
 
 @app.route("/submit-daily-score", methods=["POST"])
 def submit_daily_score():
@@ -274,21 +325,31 @@ def submit_daily_score():
     if not player or steps is None:
         return jsonify({"error": "Missing fields"}), 400
 
-    today = datetime.now(pytz.timezone('US/Pacific')).strftime("%Y-%m-%d")
-    ref = db.reference(f"leaderboards/{today}")
-    current = ref.get() or []
-
-    current.append({"player": player, "steps": steps, "duration": duration})
-    current = sorted(current, key=lambda x: (x["steps"], x["duration"]))[:5]
-    ref.set(current)
-
-    return jsonify({"message": "Score submitted to Firebase ✅"})
+    try:
+        leaderboard.submit(player, steps, duration)
+    except StoreUnavailable as e:
+        return jsonify({"error": f"Leaderboard unavailable: {e}"}), 503
+    return jsonify({"message": f"Score submitted to {store.name} ✅"})
 
 @app.route("/get-daily-leaderboard")
 def get_daily_leaderboard():
-    today = datetime.now(pytz.timezone('US/Pacific')).strftime("%Y-%m-%d")
-    ref = db.reference(f"leaderboards/{today}")
-    return jsonify(ref.get() or [])
+    try:
+        return jsonify(leaderboard.top())
+    except StoreUnavailable as e:
+        return jsonify({"error": f"Leaderboard unavailable: {e}"}), 503
+
+@app.route("/healthz")
+def healthz():
+    # Initializes the store if nothing has yet, so a failing Firebase config shows up here
+    storage_ok, storage_detail = store.ready()
+    checks = {
+        "storage": {"ok": storage_ok, "backend": store.name, "detail": storage_detail},
+        "tmdb": {"ok": bool(tmdb.api_key or os.getenv("TMDB_API_KEY"))},
+        "co_star_graph": {"ok": True, "loaded": co_star_graph is not None},
+        "daily_snapshot": {"ok": True, "ready": daily_snapshot.ready},
+    }
+    ok = all(check["ok"] for check in checks.values())
+    return jsonify({"ok": ok, "checks": checks}), 200 if ok else 503
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
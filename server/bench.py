@@ -0,0 +1,291 @@
+"""Offline benchmarks for the hot endpoints.
+
+Runs the real Flask app in-process with TMDB replaced by a transport adapter
+(tmdb.ReplayAdapter) and Firebase replaced by FakeDatabase, then reports, per
+filmography size and endpoint, latency and how many upstream calls each
+request cost, cold (empty caches) and warm.
+
+    python bench.py                              # synthetic TMDB world
+    python bench.py --fixture recorded.json      # replay recorded responses
+    python bench.py --record recorded.json       # record them (needs TMDB_API_KEY)
+    python bench.py --check bench_baseline.json  # fail on upstream-call regressions
+
+Upstream call counts are deterministic, so --check compares them exactly;
+latency is only compared when --latency-tolerance is given.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+import stub_tmdb
+from actors import actors
+from names import normalize
+from tmdb import ReplayAdapter, fixture_key, replay, split_url
+
+# Real people for --record; "small" and "large" are filmography sizes
+RECORD_SCENARIOS = {
+    "small": {
+        "current_actor": "Rachel Sennott", "goal_actor": "Dove Cameron", "query": "Rachel S",
+        "title": "Bottoms", "next_actor": "Ayo Edebiri",
+    },
+    "large": {
+        "current_actor": "Tom Hanks", "goal_actor": "Nicolas Cage", "query": "Tom H",
+        "title": "Forrest Gump", "next_actor": "Robin Wright",
+    },
+}
+
+
+class FakeReference:
+    def __init__(self, database, path):
+        self.database = database
+        self.path = path
+
+    def get(self):
+        return self.database.op(lambda data: copy.deepcopy(data.get(self.path)))
+
+    def set(self, value):
+        self.database.op(lambda data: data.__setitem__(self.path, copy.deepcopy(value)))
+
+    def transaction(self, update):
+        def run(data):
+            data[self.path] = update(copy.deepcopy(data.get(self.path)))
+            return copy.deepcopy(data[self.path])
+        return self.database.op(run)
+
+
+class FakeDatabase:
+    """Stand-in for firebase_admin.db that counts (and optionally delays) ops."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.data = {}
+        self.ops = 0
+        self._lock = threading.Lock()
+
+    def reference(self, path):
+        return FakeReference(self, path)
+
+    def op(self, fn):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.ops += 1
+            return fn(self.data)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Passes requests to TMDB and keeps every successful body by fixture key."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_path = urlparse(base_url).path.rstrip("/")
+        self.responses = {}
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.calls += 1
+        if response.ok:
+            endpoint, params = split_url(self.base_path, request.url)
+            self.responses[fixture_key(endpoint, params)] = response.json()
+        return response
+
+
+def synthetic_source():
+    world = stub_tmdb.World(actors)
+
+    def respond(endpoint, params):
+        return world.respond("/" + endpoint, {k: [v] for k, v in params.items()})
+
+    def scenario(current, goal, query):
+        person = world.by_name[normalize(current)]
+        kind, title_id = world.filmography[person["id"]][0]
+        title = world.titles[(kind, title_id)]
+        costar = next(world.people[p]["name"] for p in title["cast"] if p != person["id"])
+        return {"current_actor": current, "goal_actor": goal, "query": query,
+                "title": title["name"], "next_actor": costar}
+
+    scenarios = {
+        "small": scenario("Extra Person 11", "Extra Person 12", "Extra Person 1"),
+        "large": scenario("Tom Hanks", "Nicolas Cage", "Tom H"),
+    }
+    return respond, scenarios
+
+
+def requests_for(scenario, i):
+    return {
+        "/get-daily-actors": ("get", {}),
+        "/suggest": ("get", {"query_string": {"query": scenario["query"], "type": "actor"}}),
+        "/validate-link": ("post", {"json": {
+            "actor": scenario["current_actor"], "title": scenario["title"], "next_actor": scenario["next_actor"],
+        }}),
+        "/get-easy-options": ("post", {"json": {
+            "current_actor": scenario["current_actor"], "goal_actor": scenario["goal_actor"],
+        }}),
+        "/submit-daily-score": ("post", {"json": {"player": f"bench{i}", "steps": 3 + i % 5, "duration": i}}),
+    }
+
+
+class Bench:
+    def __init__(self, app_module, transport, database, tmp, graph=None):
+        self.app = app_module
+        self.transport = transport
+        self.database = database
+        self.tmp = tmp
+        self.graph = graph
+        self.client = app_module.app.test_client()
+
+    def reset(self):
+        """Cold start: empty TMDB cache, indexes, daily snapshot and leaderboard."""
+        from daily import DailySnapshot
+        from leaderboard import FirebaseStore, Leaderboard
+        from validation import LinkValidator
+
+        app = self.app
+        app.tmdb.cache.clear()
+        app.tmdb.observers.clear()
+        app.co_star_graph = self.graph
+        app.link_validator = LinkValidator(app.tmdb)
+        app.suggest_index = app.build_suggest_index()
+        snapshot_path = os.path.join(self.tmp, "daily_snapshot.json")
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        app.daily_snapshot = DailySnapshot(
+            actors, app.get_actor_data, graph=self.graph, warm=app.link_validator.filmography, path=snapshot_path,
+        )
+        self.database.data.clear()
+        app.store = FirebaseStore(database=self.database)
+        app.leaderboard = Leaderboard(app.store, refresh_interval=float("inf"))
+
+    def call(self, path, method, kwargs):
+        calls, ops = self.transport.calls, self.database.ops
+        started = time.perf_counter()
+        response = getattr(self.client, method)(path, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 500:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+        return elapsed, self.transport.calls - calls, self.database.ops - ops
+
+    def run(self, scenarios, repeat):
+        results = {}
+        for profile, scenario in scenarios.items():
+            results[profile] = {}
+            for path in requests_for(scenario, 0):
+                self.reset()
+                cold_ms, cold_calls, cold_ops = self.call(path, *requests_for(scenario, 0)[path])
+                warm = [self.call(path, *requests_for(scenario, i)[path]) for i in range(1, repeat + 1)]
+                latencies = sorted(w[0] for w in warm)
+                results[profile][path] = {
+                    "cold_ms": round(cold_ms, 2),
+                    "cold_calls": cold_calls,
+                    "warm_p50_ms": round(latencies[len(latencies) // 2], 2),
+                    "warm_p95_ms": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 2),
+                    "warm_max_ms": round(latencies[-1], 2),
+                    "warm_calls": sum(w[1] for w in warm),
+                    "firebase_ops": cold_ops + sum(w[2] for w in warm),
+                }
+        return results
+
+
+def report(results, repeat):
+    print(f"{'profile':<8}{'endpoint':<22}{'cold ms':>9}{'cold calls':>11}"
+          f"{'warm p50':>10}{'warm p95':>10}{'warm max':>10}{f'calls/{repeat}':>10}{'fb ops':>8}")
+    for profile, endpoints in results.items():
+        for path, r in endpoints.items():
+            print(f"{profile:<8}{path:<22}{r['cold_ms']:>9.1f}{r['cold_calls']:>11}{r['warm_p50_ms']:>10.2f}"
+                  f"{r['warm_p95_ms']:>10.2f}{r['warm_max_ms']:>10.2f}{r['warm_calls']:>10}{r['firebase_ops']:>8}")
+
+
+def check(results, baseline, latency_tolerance=None):
+    failures = []
+    for profile, endpoints in baseline.items():
+        for path, expected in endpoints.items():
+            got = results.get(profile, {}).get(path)
+            if got is None:
+                failures.append(f"{profile} {path}: missing from this run")
+                continue
+            for key in ("cold_calls", "warm_calls", "firebase_ops"):
+                if got[key] > expected[key]:
+                    failures.append(f"{profile} {path}: {key} {got[key]} > baseline {expected[key]}")
+            if latency_tolerance is not None:
+                for key in ("cold_ms", "warm_p50_ms"):
+                    limit = expected[key] * (1 + latency_tolerance)
+                    if got[key] > limit:
+                        failures.append(f"{profile} {path}: {key} {got[key]} > {limit:.2f}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline endpoint benchmarks.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixture", help="replay recorded TMDB responses from this file")
+    source.add_argument("--record", help="call the real TMDB and save responses to this file")
+    parser.add_argument("--repeat", type=int, default=20, help="warm requests per endpoint")
+    parser.add_argument("--tmdb-latency", type=float, default=20, help="simulated TMDB delay per call, in ms")
+    parser.add_argument("--firebase-latency", type=float, default=20, help="simulated Firebase delay per op, in ms")
+    parser.add_argument("--graph", action="store_true", help="also build and use the co-star graph")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--check", help="baseline results to compare against")
+    parser.add_argument("--latency-tolerance", type=float, help="allowed latency growth over baseline, e.g. 0.5")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="screenlink-bench-")
+    os.environ.update({
+        "LEADERBOARD_BACKEND": "json",
+        "LEADERBOARD_FILE": os.path.join(tmp, "leaderboard.json"),
+        "DAILY_SNAPSHOT": os.path.join(tmp, "daily_snapshot.json"),
+        "CO_STAR_GRAPH": os.path.join(tmp, "co_star_graph.json"),
+    })
+    import app as app_module
+    import graph
+    from tmdb import RecordedClient
+
+    client = app_module.tmdb
+    if args.record:
+        transport = RecordingAdapter(client.base_url)
+        scenarios = RECORD_SCENARIOS
+    else:
+        if args.fixture:
+            with open(args.fixture) as f:
+                recorded = json.load(f)
+            respond, scenarios = replay(recorded["responses"]), recorded["scenarios"]
+        else:
+            respond, scenarios = synthetic_source()
+        transport = ReplayAdapter(client.base_url, respond, args.tmdb_latency / 1000)
+    client.session.mount(client.base_url, transport)
+
+    co_star_graph = None
+    if args.graph:
+        if args.record:
+            co_star_graph = graph.build(client, actors)
+        else:
+            builder = RecordedClient({})
+            builder.session.mount(builder.base_url, ReplayAdapter(builder.base_url, respond))
+            co_star_graph = graph.build(builder, actors)
+
+    results = Bench(app_module, transport, FakeDatabase(args.firebase_latency / 1000), tmp, co_star_graph).run(
+        scenarios, args.repeat
+    )
+    report(results, args.repeat)
+
+    if args.record:
+        with open(args.record, "w") as f:
+            json.dump({"scenarios": scenarios, "responses": transport.responses}, f)
+        print(f"✅ recorded {len(transport.responses)} responses -> {args.record}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.check:
+        with open(args.check) as f:
+            failures = check(results, json.load(f), args.latency_tolerance)
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1 if failures else 0)
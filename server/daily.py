@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, time as dtime
+from functools import lru_cache
+
+SNAPSHOT_PATH = os.getenv("DAILY_SNAPSHOT", os.path.join(os.path.dirname(__file__), "daily_snapshot.json"))
+
+
+@lru_cache(maxsize=None)
+def pacific():
+    # Deferred so importing the app doesn't pay for pytz's zone database
+    import pytz
+    return pytz.timezone("US/Pacific")
+
+
+def pacific_today():
+    return datetime.now(pacific()).strftime("%Y-%m-%d")
+
+
+def seconds_until_rollover():
+    now = datetime.now(pacific())
+    midnight = pacific().localize(datetime.combine(now.date() + timedelta(days=1), dtime.min))
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def _complete(snapshot):
+    return bool(snapshot["start"].get("id") and snapshot["goal"].get("id"))
+
+
+class DailySnapshot:
+    """The day's puzzle, computed once per Pacific day and served from memory.
+
+    `lookup(name)` returns the public actor card ({"name", "id", "image"}).
+    With a co-star `graph` the snapshot also carries the optimal step count,
+    and `warm(name)` is called for both actors so their filmographies are
+    already indexed when the first player starts linking.
+
+    Nothing happens until the first `get()`: that reads the persisted
+    snapshot and, with `rollover=True`, arms the midnight rebuild timer.
+
+    If either actor lookup fails (e.g. TMDB rate limiting), the incomplete
+    snapshot is served but neither saved nor kept for the day: it is rebuilt
+    on the first `get()` after `retry_interval` seconds.
+    """
+
+    def __init__(self, actors, lookup, graph=None, warm=None, path=SNAPSHOT_PATH, rollover=False,
+                 retry_interval=30):
+        self.actors = actors
+        self.lookup = lookup
+        self.graph = graph
+        self.warm = warm
+        self.path = path
+        self.rollover = rollover
+        self.retry_interval = retry_interval
+        self._current = None  # (date, body, etag, complete)
+        self._retry_at = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._started = False
+
+    @property
+    def ready(self):
+        current = self._current
+        return current is not None and current[0] == pacific_today() and current[3]
+
+    def get(self):
+        """(date, body, etag, complete) for today, building it first if needed."""
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    self._load()
+                    if self.rollover:
+                        self.schedule_rollover()
+                    self._started = True
+
+        today = pacific_today()
+        current = self._current
+        if self._stale(current, today):
+            with self._lock:
+                if self._stale(self._current, today):
+                    self.refresh(today)
+            current = self._current
+        return current
+
+    def _stale(self, current, today):
+        if current is None or current[0] != today:
+            return True
+        return not current[3] and time.monotonic() >= self._retry_at
+
+    def refresh(self, day=None):
+        day = day or pacific_today()
+        rng = random.Random(day)
+        selected = rng.sample(self.actors, 2)
+        snapshot = {
+            "date": day,
+            "start": self.lookup(selected[0]),
+            "goal": self.lookup(selected[1]),
+            "optimal_steps": None,
+        }
+        if self.graph is not None:
+            snapshot["optimal_steps"] = self.graph.next_links(*selected)[0]
+        if self.warm is not None:
+            for name in selected:
+                self.warm(name)
+
+        # A failed TMDB search must not pin a broken puzzle for the whole day
+        complete = _complete(snapshot)
+        if not complete:
+            self._retry_at = time.monotonic() + self.retry_interval
+        self._set(snapshot)
+        if complete:
+            self._save(snapshot)
+        return snapshot
+
+    def schedule_rollover(self):
+        """Rebuild just after every Pacific midnight in a background timer."""
+        self._timer = threading.Timer(seconds_until_rollover() + 1, self._rollover)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _rollover(self):
+        try:
+            with self._lock:
+                self.refresh()
+        except Exception as e:
+            print(f"⚠️  daily snapshot rollover failed: {e}", file=sys.stderr)
+        finally:
+            self.schedule_rollover()
+
+    def _set(self, snapshot):
+        body = json.dumps(snapshot, sort_keys=True).encode()
+        etag = hashlib.sha1(body).hexdigest()[:16]
+        self._current = (snapshot["date"], body, etag, _complete(snapshot))
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        if snapshot.get("date") == pacific_today():
+            self._set(snapshot)
+
+    def _save(self, snapshot):
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️  could not persist daily snapshot: {e}", file=sys.stderr)
@@ -0,0 +1,252 @@
+"""Local actor–title co-appearance graph.
+
+The graph is bipartite: every edge joins an actor to a movie/show they were
+cast in. Node ids are plain ints (actors first, then titles) and adjacency is
+stored in CSR form, i.e. one `offsets` array and one flat `edges` array, so a
+few hundred thousand edges stay a few MB in memory and on disk.
+
+Build it offline from TMDB (or a recorded fixture) with:
+
+    python graph.py [--fixture recorded.json] [--out co_star_graph.json]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+from array import array
+
+from names import normalize
+
+GRAPH_PATH = os.getenv("CO_STAR_GRAPH", os.path.join(os.path.dirname(__file__), "co_star_graph.json"))
+
+# TMDB TV genre ids for News, Reality and Talk; same exclusions as the hint filter
+EXCLUDED_GENRE_IDS = {10763, 10764, 10767}
+
+
+def _pack(values):
+    arr = array("i", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def _unpack(data):
+    arr = array("i")
+    arr.frombytes(base64.b64decode(data))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class CoStarGraph:
+    def __init__(self, actors, titles, offsets, edges, aliases=None):
+        self.actors = actors  # [(tmdb_id, name, profile_path, popularity)]
+        self.titles = titles  # [(kind, tmdb_id, name, popularity, poster_path)]
+        self.offsets = offsets
+        self.edges = edges
+        # Other spellings of an actor's name, e.g. the curated list's {normalized: index}
+        self.aliases = aliases or {}
+        self._by_name = {}
+        for i, actor in enumerate(actors):
+            self._by_name.setdefault(normalize(actor[1]), i)
+        for alias, i in self.aliases.items():
+            self._by_name.setdefault(alias, i)
+
+    @classmethod
+    def from_edges(cls, actors, titles, pairs, aliases=None):
+        """Build from (actor_index, title_index) pairs."""
+        n_actors = len(actors)
+        adjacency = [[] for _ in range(n_actors + len(titles))]
+        for a, t in set(pairs):
+            adjacency[a].append(n_actors + t)
+            adjacency[n_actors + t].append(a)
+
+        offsets = array("i", [0])
+        edges = array("i")
+        for neighbors in adjacency:
+            edges.extend(sorted(neighbors))
+            offsets.append(len(edges))
+        return cls(actors, titles, offsets, edges, aliases)
+
+    @classmethod
+    def load(cls, path=GRAPH_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        # Graphs saved before images were kept have shorter rows; pad them
+        return cls(
+            [tuple(a + [None, 0][len(a) - 2:]) for a in data["actors"]],
+            [tuple(t + [None][len(t) - 4:]) for t in data["titles"]],
+            _unpack(data["offsets"]),
+            _unpack(data["edges"]),
+            data.get("aliases"),
+        )
+
+    def save(self, path=GRAPH_PATH):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "actors": self.actors,
+                "titles": self.titles,
+                "offsets": _pack(self.offsets),
+                "edges": _pack(self.edges),
+                "aliases": self.aliases,
+            }, f)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.edges) // 2
+
+    def actor_index(self, name):
+        return self._by_name.get(normalize(name))
+
+    def neighbors(self, node):
+        return self.edges[self.offsets[node]:self.offsets[node + 1]]
+
+    def node_name(self, node):
+        if node < len(self.actors):
+            return self.actors[node][1]
+        return self.titles[node - len(self.actors)][2]
+
+    def shortest_path_nodes(self, src, dst):
+        """Bidirectional BFS from `src` to `dst`.
+
+        Returns (length, depth, on_path) where `length` counts edges,
+        `on_path` holds every node lying on some shortest path and `depth`
+        gives each of those nodes' distance from `src`. Returns
+        (None, {}, set()) when the two nodes are not connected.
+        """
+        if src == dst:
+            return 0, {src: 0}, {src}
+
+        dist_s, dist_t = {src: 0}, {dst: 0}
+        front_s, front_t = [src], [dst]
+        best = None
+        while front_s and front_t and best is None:
+            # Always grow the smaller frontier, and finish the whole layer
+            # so every meeting point at the optimal length is recorded
+            forward = len(front_s) <= len(front_t)
+            front, dist, other = (front_s, dist_s, dist_t) if forward else (front_t, dist_t, dist_s)
+            layer = []
+            for u in front:
+                for v in self.neighbors(u):
+                    if v in dist:
+                        continue
+                    dist[v] = dist[u] + 1
+                    layer.append(v)
+                    if v in other:
+                        total = dist[v] + other[v]
+                        best = total if best is None else min(best, total)
+            if forward:
+                front_s = layer
+            else:
+                front_t = layer
+
+        if best is None:
+            return None, {}, set()
+
+        meet = [v for v in dist_s if v in dist_t and dist_s[v] + dist_t[v] == best]
+        on_path = set(meet)
+        for dist in (dist_s, dist_t):
+            stack = list(meet)
+            while stack:
+                v = stack.pop()
+                for u in self.neighbors(v):
+                    if u not in on_path and dist.get(u) == dist[v] - 1:
+                        on_path.add(u)
+                        stack.append(u)
+        depth = {v: dist_s[v] if v in dist_s else best - dist_t[v] for v in on_path}
+        return best, depth, on_path
+
+    def next_links(self, current, goal):
+        """First (title, actor) links along shortest paths from `current` to `goal`.
+
+        Returns (steps, links) where `steps` is the optimal number of title
+        hops, or (None, []) if either actor is unknown or they aren't linked.
+        Titles come most popular first.
+        """
+        src, dst = self.actor_index(current), self.actor_index(goal)
+        if src is None or dst is None:
+            return None, []
+
+        length, dist, on_path = self.shortest_path_nodes(src, dst)
+        if not length:
+            return length, []
+
+        n_actors = len(self.actors)
+        titles = sorted(
+            (v for v in on_path if dist.get(v) == 1),
+            key=lambda v: self.titles[v - n_actors][3],
+            reverse=True,
+        )
+        links = []
+        for title in titles:
+            actors = [u for u in self.neighbors(title) if u in on_path and dist.get(u) == 2]
+            links.append((self.node_name(title), [self.node_name(u) for u in actors]))
+        return length // 2, links
+
+
+def build(client, names, titles_per_actor=40, cast_per_title=25):
+    """Crawl each named actor's top titles and their casts into a CoStarGraph."""
+    actors, actor_ix = [], {}
+    titles, title_ix = [], {}
+    pairs = []
+    aliases = {}
+
+    def add_actor(tmdb_id, name, person):
+        if tmdb_id not in actor_ix:
+            actor_ix[tmdb_id] = len(actors)
+            actors.append((tmdb_id, name, person.get("profile_path"), person.get("popularity") or 0))
+        return actor_ix[tmdb_id]
+
+    def add_title(kind, tmdb_id, name, credit):
+        if (kind, tmdb_id) not in title_ix:
+            title_ix[(kind, tmdb_id)] = len(titles)
+            titles.append((kind, tmdb_id, name, credit.get("popularity", 0), credit.get("poster_path")))
+        return title_ix[(kind, tmdb_id)]
+
+    for name in names:
+        results = client.get("search/person", query=name).get("results") or []
+        if not results:
+            print(f"⚠️  no TMDB match for {name}", file=sys.stderr)
+            continue
+        actor = add_actor(results[0]["id"], results[0].get("name") or name, results[0])
+        # Keep our spelling findable too; it's what the daily puzzle asks about
+        if normalize(name) != normalize(actors[actor][1]):
+            aliases[normalize(name)] = actor
+
+        credits = []
+        for kind in ("movie", "tv"):
+            for credit in client.get(f"person/{results[0]['id']}/{kind}_credits").get("cast", []):
+                title = credit.get("title") or credit.get("name")
+                if title and not EXCLUDED_GENRE_IDS & set(credit.get("genre_ids", [])):
+                    credits.append((kind, credit, title))
+        credits.sort(key=lambda c: c[1].get("popularity", 0), reverse=True)
+        credits = credits[:titles_per_actor]
+
+        pages = client.get_many([(f"{kind}/{credit['id']}/credits", {}) for kind, credit, _ in credits])
+        for (kind, credit, title), page in zip(credits, pages):
+            t = add_title(kind, credit["id"], title, credit)
+            pairs.append((actor, t))
+            for member in (page or {}).get("cast", [])[:cast_per_title]:
+                if member.get("name"):
+                    pairs.append((add_actor(member["id"], member["name"], member), t))
+
+    return CoStarGraph.from_edges(actors, titles, pairs, aliases)
+
+
+if __name__ == "__main__":
+    from actors import actors
+    from tmdb import RecordedClient, client
+
+    parser = argparse.ArgumentParser(description="Build the local co-star graph.")
+    parser.add_argument("--fixture", help="replay recorded TMDB responses from this JSON file")
+    parser.add_argument("--out", default=GRAPH_PATH)
+    parser.add_argument("--titles-per-actor", type=int, default=40)
+    parser.add_argument("--cast-per-title", type=int, default=25)
+    args = parser.parse_args()
+
+    source = RecordedClient.from_file(args.fixture) if args.fixture else client
+    graph = build(source, actors, args.titles_per_actor, args.cast_per_title)
+    graph.save(args.out)
+    print(f"✅ {len(graph.actors)} actors, {len(graph.titles)} titles, {len(graph)} edges -> {args.out}")
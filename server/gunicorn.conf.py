@@ -0,0 +1,14 @@
+# Production server: `gunicorn -c gunicorn.conf.py app:app`
+#
+# gthread workers let one slow TMDB round-trip tie up a thread instead of the
+# whole process. Caches, the suggest index and the daily snapshot live per
+# worker process, so prefer more threads over more workers.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+keepalive = 5
+accesslog = "-" if os.getenv("GUNICORN_ACCESS_LOG") else None
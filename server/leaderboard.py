@@ -0,0 +1,221 @@
+import base64
+import fcntl
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+import metrics
+from daily import pacific_today
+
+
+def rank(entry):
+    return (entry["steps"], entry["duration"])
+
+
+def merge_top(current, entries, size):
+    return sorted((current or []) + entries, key=rank)[:size]
+
+
+class StoreUnavailable(Exception):
+    pass
+
+
+# A store provides `name`, `load(day)`, `merge(day, entries, size)` and
+# `ready()`, which returns (ok, detail) for the health check.
+
+class FirebaseStore:
+    """Leaderboards under `leaderboards/{day}` in the Realtime Database.
+
+    firebase_admin is imported and initialized on first use rather than at
+    startup; it's slow to import and routes like /suggest never need it.
+    """
+
+    name = "Firebase"
+
+    def __init__(self, cred_b64=None, database_url=None, database=None):
+        # `database` stands in for firebase_admin.db, e.g. bench.FakeDatabase
+        self.cred_b64 = cred_b64
+        self.database_url = database_url
+        self.db = database
+        self.error = None
+        self._lock = threading.Lock()
+
+    def _database(self):
+        if self.db is not None:
+            return self.db
+        with self._lock:
+            if self.db is None:
+                try:
+                    import firebase_admin
+                    from firebase_admin import credentials, db
+
+                    if not self.cred_b64:
+                        raise ValueError("FIREBASE_CRED_B64 is not set")
+                    # 🔐 Load Firebase credentials from environment variable
+                    key_json = json.loads(base64.b64decode(self.cred_b64))
+                    cred = credentials.Certificate(key_json)
+                    firebase_admin.initialize_app(cred, {"databaseURL": self.database_url})
+                    self.db = db
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise StoreUnavailable(self.error) from e
+        return self.db
+
+    def ready(self):
+        try:
+            self._database()
+            return True, "initialized"
+        except StoreUnavailable as e:
+            return False, str(e)
+
+    def load(self, day):
+        return self._database().reference(f"leaderboards/{day}").get() or []
+
+    def merge(self, day, entries, size):
+        # Transactions retry on concurrent writes instead of overwriting them
+        return self._database().reference(f"leaderboards/{day}").transaction(
+            lambda current: merge_top(current, entries, size)
+        )
+
+
+class JsonFileStore:
+    """Same {day: [entries]} layout as daily_leaderboard.json, for local runs."""
+
+    name = "local file"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def ready(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if os.access(directory, os.W_OK):
+            return True, self.path
+        return False, f"{directory} is not writable"
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, day):
+        return self._read().get(day, [])
+
+    def merge(self, day, entries, size):
+        # flock covers other worker processes sharing the file
+        with self._lock, open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read()
+            data[day] = merge_top(data.get(day), entries, size)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+            return data[day]
+
+
+def store_from_env(environ=os.environ):
+    """Build the store named by LEADERBOARD_BACKEND (default "firebase")."""
+    backend = environ.get("LEADERBOARD_BACKEND", "firebase")
+    if backend == "json":
+        default = os.path.join(os.path.dirname(__file__), "daily_leaderboard.json")
+        return JsonFileStore(environ.get("LEADERBOARD_FILE", default))
+    if backend == "firebase":
+        return FirebaseStore(
+            environ.get("FIREBASE_CRED_B64"),
+            environ.get("FIREBASE_DB_URL", "https://screen-link-2025-default-rtdb.firebaseio.com/"),
+        )
+    raise ValueError(f"unknown LEADERBOARD_BACKEND {backend!r}; expected 'firebase' or 'json'")
+
+
+class Leaderboard:
+    """Today's top `size` scores, kept in memory in front of a store.
+
+    Reads are served from a bounded heap and re-synced with the store at most
+    every `refresh_interval` seconds. Submissions that can't beat the current
+    top list never reach the store; the rest go through `store.merge`.
+
+    Store calls run outside the lock. Each one takes a ticket first, and a
+    result is dropped if a newer load or merge has already been applied.
+    While one refresh is in flight, other readers get the current heap.
+    """
+
+    def __init__(self, store, size=5, refresh_interval=5):
+        self.store = store
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._tickets = itertools.count(1)
+        self._applied = 0
+        self._loading = False
+        self._day = None
+        self._heap = []  # worst entry on top, as (-steps, -duration, -seq, entry)
+        self._synced_at = 0
+
+    def _push(self, entry):
+        item = (-entry["steps"], -entry["duration"], -next(self._seq), entry)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        else:
+            heapq.heappushpop(self._heap, item)
+
+    def _qualifies(self, entry):
+        if len(self._heap) < self.size:
+            return True
+        worst = self._heap[0]
+        return rank(entry) < (-worst[0], -worst[1])
+
+    def _apply(self, ticket, entries, day):
+        # A slower, older store call must not overwrite a newer result, and a
+        # late one for yesterday must not replace today's board
+        if self._day is not None and (day < self._day or (day == self._day and ticket < self._applied)):
+            return
+        self._applied = ticket
+        self._day = day
+        self._heap = []
+        for entry in entries:
+            self._push(entry)
+        self._synced_at = time.monotonic()
+
+    def _fresh(self, day):
+        with self._lock:
+            if self._day == day and time.monotonic() - self._synced_at <= self.refresh_interval:
+                return
+            if self._day == day and self._loading:
+                return
+            self._loading = True
+            ticket = next(self._tickets)
+        try:
+            with metrics.timed("leaderboard", f"{self.store.name}/load"):
+                entries = self.store.load(day)
+        finally:
+            with self._lock:
+                self._loading = False
+        with self._lock:
+            self._apply(ticket, entries, day)
+
+    def top(self):
+        day = pacific_today()
+        self._fresh(day)
+        with self._lock:
+            return [item[3] for item in sorted(self._heap, reverse=True)]
+
+    def submit(self, player, steps, duration=0):
+        entry = {"player": player, "steps": steps, "duration": duration}
+        day = pacific_today()
+        self._fresh(day)
+        with self._lock:
+            if self._day == day and not self._qualifies(entry):
+                return False
+            ticket = next(self._tickets)
+        with metrics.timed("leaderboard", f"{self.store.name}/merge"):
+            stored = self.store.merge(day, [entry], self.size)
+        with self._lock:
+            self._apply(ticket, stored or [], day)
+        return True
@@ -0,0 +1,167 @@
+"""Load test the backend against the stub TMDB.
+
+Starts stub_tmdb, launches the app (gunicorn by default, or the Flask dev
+server for comparison) pointed at it, drives a mix of player traffic from
+concurrent clients and prints requests/second and latency percentiles.
+
+    python loadtest.py --server gunicorn --workers 2 --threads 16 --clients 32
+    python loadtest.py --server dev
+    python loadtest.py --target http://127.0.0.1:5000 --tmdb-port 8099
+
+With --target the server must already be running with
+TMDB_BASE_URL=http://127.0.0.1:8099 (and LEADERBOARD_BACKEND=json).
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+import stub_tmdb
+from actors import actors
+from names import normalize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else 0.0
+
+
+def launch(kind, port, tmdb_url, workers, threads, tmp):
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        TMDB_BASE_URL=tmdb_url,
+        TMDB_API_KEY="stub",
+        LEADERBOARD_BACKEND="json",
+        LEADERBOARD_FILE=os.path.join(tmp, "leaderboard.json"),
+        DAILY_SNAPSHOT=os.path.join(tmp, "daily_snapshot.json"),
+        CO_STAR_GRAPH=os.path.join(tmp, "no_graph.json"),
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+    )
+    if kind == "dev":
+        cmd = [sys.executable, "app.py"]
+    else:
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"]
+    proc = subprocess.Popen(cmd, cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(base, timeout=1)
+            return proc, base
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    proc.kill()
+    sys.exit(f"❌ {kind} server did not come up on {base}")
+
+
+def scenario(rng, world):
+    """One player action, weighted roughly like real traffic."""
+    actor, other = rng.sample(actors, 2)
+    roll = rng.random()
+    if roll < 0.45:
+        name = rng.choice(actors)
+        return "/suggest", "get", {"params": {"query": name[:rng.randint(2, 6)], "type": "actor"}}
+    if roll < 0.60:
+        return "/get-daily-actors", "get", {}
+    if roll < 0.75:
+        return "/get-daily-leaderboard", "get", {}
+    if roll < 0.90:
+        person = world.by_name[normalize(actor)]
+        kind, title_id = rng.choice(world.filmography[person["id"]])
+        title = world.titles[(kind, title_id)]
+        costar = world.people[rng.choice(title["cast"])]["name"]
+        return "/validate-link", "post", {"json": {"actor": actor, "title": title["name"], "next_actor": costar}}
+    if roll < 0.97:
+        return "/get-easy-options", "post", {"json": {"current_actor": actor, "goal_actor": other}}
+    return "/submit-daily-score", "post", {"json": {"player": f"bot{rng.randint(1, 999)}", "steps": rng.randint(1, 8)}}
+
+
+def run(base, world, clients, duration, seed):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def client(n):
+        rng = random.Random(seed + n)
+        session = requests.Session()
+        while time.monotonic() < stop:
+            path, method, kwargs = scenario(rng, world)
+            started = time.perf_counter()
+            try:
+                ok = getattr(session, method)(base + path, timeout=60, **kwargs).status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies[path].append(elapsed)
+                errors[path] += not ok
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.monotonic() - started
+
+
+def report(latencies, errors, elapsed):
+    print(f"{'endpoint':<24}{'count':>8}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    every = []
+    for path in sorted(latencies):
+        values = latencies[path]
+        every += values
+        print(f"{path:<24}{len(values):>8}{errors[path]:>8}{len(values) / elapsed:>9.1f}"
+              f"{percentile(values, 50):>10.1f}{percentile(values, 99):>10.1f}")
+    print(f"{'total':<24}{len(every):>8}{sum(errors.values()):>8}{len(every) / elapsed:>9.1f}"
+          f"{percentile(every, 50):>10.1f}{percentile(every, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the backend against a stubbed TMDB.")
+    parser.add_argument("--server", choices=["gunicorn", "dev"], default="gunicorn")
+    parser.add_argument("--target", help="hit an already running server instead of launching one")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20, help="seconds")
+    parser.add_argument("--tmdb-port", type=int, default=0, help="fixed stub TMDB port, for use with --target")
+    parser.add_argument("--tmdb-latency", type=float, default=80, help="stub TMDB delay per call, in ms")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    world = stub_tmdb.World(actors)
+    stub = stub_tmdb.serve(world, port=args.tmdb_port, latency=args.tmdb_latency / 1000)
+    tmdb_url = f"http://127.0.0.1:{stub.server_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        if args.target:
+            base = args.target.rstrip("/")
+        else:
+            proc, base = launch(args.server, args.port, tmdb_url, args.workers, args.threads, tmp)
+        try:
+            label = args.target or (
+                "Flask dev server" if args.server == "dev"
+                else f"gunicorn (workers={args.workers}, threads={args.threads})"
+            )
+            print(f"🎬 {label}, {args.clients} clients for {args.duration:.0f}s, "
+                  f"TMDB latency {args.tmdb_latency:.0f} ms")
+            report(*run(base, world, args.clients, args.duration, args.seed))
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
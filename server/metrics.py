@@ -0,0 +1,147 @@
+"""Request and upstream-call instrumentation, exposed in Prometheus text format.
+
+Every request gets a trace (a list in a ContextVar) that upstream clients
+append to via `record`/`timed`; the same calls also feed process-wide
+histograms and counters rendered by `render()` at /metrics. Under gunicorn
+each worker process keeps its own numbers.
+"""
+import contextvars
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# person/31/movie_credits -> person/{id}/movie_credits, to keep label sets small
+_IDS = re.compile(r"/\d+")
+
+_trace = contextvars.ContextVar("upstream_trace", default=None)
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            i = bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', bound)])} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, key)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+request_seconds = Histogram(
+    "screenlink_request_duration_seconds", "Time spent in route handlers.", ["route", "method", "status"],
+)
+upstream_seconds = Histogram(
+    "screenlink_upstream_duration_seconds", "Time spent per upstream call.", ["service", "endpoint", "cache"],
+)
+upstream_calls = Counter(
+    "screenlink_upstream_calls_total", "Upstream calls by outcome.", ["service", "endpoint", "status", "cache"],
+)
+
+
+def start_trace():
+    trace = []
+    _trace.set(trace)
+    return trace
+
+
+def end_trace():
+    _trace.set(None)
+
+
+def record(service, endpoint, duration, status, cache="none"):
+    endpoint = _IDS.sub("/{id}", endpoint)
+    upstream_seconds.observe(duration, service=service, endpoint=endpoint, cache=cache)
+    upstream_calls.inc(service=service, endpoint=endpoint, status=status, cache=cache)
+    trace = _trace.get()
+    if trace is not None:
+        trace.append({"service": service, "endpoint": endpoint, "ms": round(duration * 1000, 1),
+                      "status": status, "cache": cache})
+
+
+@contextmanager
+def timed(service, endpoint):
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        record(service, endpoint, time.perf_counter() - started, status)
+
+
+def breakdown(trace):
+    """Calls in a trace grouped by (service, endpoint, cache), slowest first."""
+    groups = {}
+    for call in trace:
+        group = groups.setdefault((call["service"], call["endpoint"], call["cache"]), {"calls": 0, "ms": 0.0})
+        group["calls"] += 1
+        group["ms"] = round(group["ms"] + call["ms"], 1)
+    return [
+        {"service": s, "endpoint": e, "cache": c, **group}
+        for (s, e, c), group in sorted(groups.items(), key=lambda item: -item[1]["ms"])
+    ]
+
+
+def render(extra=()):
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    lines += extra
+    return "\n".join(lines) + "\n"
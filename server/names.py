@@ -0,0 +1,9 @@
+import re
+import unicodedata
+
+
+def normalize(text):
+    """Fold a person or title name for matching: no accents, case or punctuation."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
@@ -0,0 +1,124 @@
+"""A local stand-in for the TMDB API, for load tests.
+
+Serves a deterministic synthetic world (people, movies, shows and casts) over
+HTTP with an optional per-request delay that mimics TMDB's round-trip time.
+Point the server at it with TMDB_BASE_URL=http://127.0.0.1:<port>.
+
+    python stub_tmdb.py --port 8099 --latency 80
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from names import normalize
+from tmdb import NOT_FOUND
+
+
+class World:
+    """Synthetic people and titles; `names` get the big filmographies."""
+
+    def __init__(self, names, extras=3000, titles=2000, cast_size=15, seed=7):
+        rng = random.Random(seed)
+        self.people = {}
+        for i, name in enumerate(list(names) + [f"Extra Person {n}" for n in range(extras)], start=1):
+            self.people[i] = {"id": i, "name": name, "profile_path": f"/p{i}.jpg", "popularity": rng.uniform(1, 100)}
+        self.by_name = {normalize(p["name"]): p for p in self.people.values()}
+
+        stars = list(range(1, len(names) + 1))
+        everyone = list(self.people)
+        self.titles = {}
+        self.filmography = {i: [] for i in self.people}
+        for t in range(1, titles + 1):
+            kind = "movie" if t % 3 else "tv"
+            cast = rng.sample(stars, 3) + rng.sample(everyone, cast_size - 3)
+            genre = "Talk" if kind == "tv" and t % 17 == 0 else rng.choice(["Drama", "Comedy", "Action"])
+            self.titles[(kind, t)] = {
+                "id": t,
+                "kind": kind,
+                "name": f"{'Film' if kind == 'movie' else 'Show'} {t}",
+                "poster_path": f"/t{t}.jpg",
+                "popularity": rng.uniform(1, 200),
+                "genres": [{"id": t % 50, "name": genre}],
+                "cast": list(dict.fromkeys(cast)),
+            }
+            for person in self.titles[(kind, t)]["cast"]:
+                self.filmography[person].append((kind, t))
+
+    def _credit(self, title):
+        key = "title" if title["kind"] == "movie" else "name"
+        return {"id": title["id"], key: title["name"], "poster_path": title["poster_path"],
+                "popularity": title["popularity"], "genre_ids": [g["id"] for g in title["genres"]]}
+
+    def _cast(self, title):
+        return [dict(self.people[p], order=n) for n, p in enumerate(title["cast"])]
+
+    def respond(self, path, query):
+        q = (query.get("query") or [""])[0]
+        if path == "/search/person":
+            person = self.by_name.get(normalize(q))
+            results = [person] if person else [p for p in self.people.values() if normalize(q) in normalize(p["name"])][:20]
+            return 200, {"page": 1, "results": results}
+        if path == "/search/multi":
+            hits = [dict(self._credit(t), media_type=t["kind"]) for t in self.titles.values()
+                    if normalize(q) in normalize(t["name"])][:20]
+            return 200, {"page": 1, "results": hits}
+
+        m = re.fullmatch(r"/person/(\d+)/(movie|tv)_credits", path)
+        if m:
+            person, kind = int(m.group(1)), m.group(2)
+            if person not in self.people:
+                return 404, NOT_FOUND
+            return 200, {"id": person, "cast": [self._credit(self.titles[k]) for k in self.filmography[person] if k[0] == kind]}
+
+        m = re.fullmatch(r"/(movie|tv)/(\d+)(/credits|/aggregate_credits)?", path)
+        if m and (m.group(1), int(m.group(2))) in self.titles:
+            title = self.titles[(m.group(1), int(m.group(2)))]
+            if m.group(3):
+                return 200, {"id": title["id"], "cast": self._cast(title)}
+            return 200, dict(self._credit(title), genres=title["genres"])
+        return 404, NOT_FOUND
+
+
+def serve(world, host="127.0.0.1", port=0, latency=0.0):
+    """Start the stub on a daemon thread and return the running server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            status, body = world.respond(url.path, parse_qs(url.query))
+            if latency:
+                time.sleep(latency)
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    from actors import actors
+
+    parser = argparse.ArgumentParser(description="Serve a synthetic TMDB API locally.")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0, help="added delay per request, in ms")
+    args = parser.parse_args()
+
+    server = serve(World(actors), port=args.port, latency=args.latency / 1000)
+    print(f"✅ stub TMDB on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
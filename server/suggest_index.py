@@ -0,0 +1,132 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from names import normalize
+from tmdb import image_url
+
+
+def _merge(keys, added):
+    """Merge sorted `added` into sorted `keys` with a single copy of `keys`."""
+    if len(added) > len(keys) // 16:
+        return sorted(keys + added)
+    merged, start = [], 0
+    for key in added:
+        i = bisect_left(keys, key, start)
+        merged.extend(keys[start:i])
+        merged.append(key)
+        start = i
+    merged.extend(keys[start:])
+    return merged
+
+
+class SuggestIndex:
+    """In-memory prefix index of actor and title names for /suggest.
+
+    Each kind ("actor" or "title") keeps a sorted list of (token, name) keys,
+    one per word start, so "han" finds "Tom Hanks" as well as "Hannah". A
+    lookup is a bisect to the first key with the prefix and a short scan;
+    matches rank curated actors first, then by TMDB popularity.
+
+    New keys go to a small sorted `recent` list that is folded into the main
+    one every `merge_every` keys, so harvesting a cast doesn't shift the whole
+    main list once per name while readers wait on the lock.
+    """
+
+    def __init__(self, max_entries=200_000, scan_limit=2000, merge_every=8192):
+        self.max_entries = max_entries
+        self.scan_limit = scan_limit
+        self.merge_every = merge_every
+        self._entries = {"actor": {}, "title": {}}
+        self._keys = {"actor": [], "title": []}
+        self._recent = {"actor": [], "title": []}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def add(self, kind, name, image=None, popularity=0, curated=False):
+        with self._lock:
+            self._insert(kind, self._upsert(kind, name, image, popularity, curated))
+
+    def seed(self, kind, items):
+        """Bulk add (name, image, popularity, curated) tuples."""
+        with self._lock:
+            added = []
+            for item in items:
+                added.extend(self._upsert(kind, *item))
+            self._insert(kind, added)
+
+    def _insert(self, kind, added):
+        recent = self._recent[kind]
+        if len(recent) + len(added) < self.merge_every:
+            for key in added:
+                insort(recent, key)
+        else:
+            self._keys[kind] = _merge(self._keys[kind], sorted(recent + added))
+            self._recent[kind] = []
+
+    def _upsert(self, kind, name, image, popularity, curated):
+        # Returns the new sort keys for a new entry; updates an existing one in place
+        full = normalize(name)
+        if not full:
+            return []
+        entry = self._entries[kind].get(full)
+        if entry is not None:
+            entry["image"] = entry["image"] or image
+            entry["popularity"] = max(entry["popularity"], popularity or 0)
+            entry["curated"] = entry["curated"] or curated
+            return []
+        if len(self) >= self.max_entries:
+            return []
+        self._entries[kind][full] = {
+            "name": name, "image": image, "popularity": popularity or 0, "curated": curated,
+        }
+        words = full.split(" ")
+        return [(" ".join(words[i:]), full) for i in range(len(words))]
+
+    def search(self, kind, query, limit=10, require_image=False):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            matches = {}
+            for keys in (self._recent[kind], self._keys[kind]):
+                i = bisect_left(keys, (prefix, ""))
+                while i < len(keys) and keys[i][0].startswith(prefix) and len(matches) < self.scan_limit:
+                    entry = self._entries[kind][keys[i][1]]
+                    if entry["image"] or not require_image:
+                        matches[keys[i][1]] = entry
+                    i += 1
+            ranked = heapq.nlargest(limit, matches.values(), key=lambda e: (e["curated"], e["popularity"]))
+        return [{"name": e["name"], "image": e["image"]} for e in ranked]
+
+    def harvest(self, endpoint, data):
+        """TMDBClient observer: index every person and title in a response.
+
+        Everything found is added with one `seed` call (one lock hold) per kind.
+        """
+        found = {"actor": [], "title": []}
+        if endpoint.startswith("search/"):
+            for r in data.get("results") or []:
+                kind = r.get("media_type", "person" if endpoint == "search/person" else None)
+                self._collect(found, "person" if kind == "person" else "title", r)
+        elif endpoint.endswith("credits") and endpoint.startswith("person/"):
+            for credit in data.get("cast") or []:
+                self._collect(found, "title", credit)
+        elif endpoint.endswith("credits"):
+            for person in data.get("cast") or []:
+                self._collect(found, "person", person)
+        elif endpoint.startswith(("movie/", "tv/")):
+            self._collect(found, "title", data)
+
+        for kind, items in found.items():
+            if items:
+                self.seed(kind, items)
+
+    def _collect(self, found, kind, r):
+        if kind == "person":
+            found["actor"].append((r.get("name"), image_url(r.get("profile_path")), r.get("popularity"), False))
+        else:
+            name = r.get("title") or r.get("name") or r.get("original_name")
+            found["title"].append((name, image_url(r.get("poster_path")), r.get("popularity"), False))
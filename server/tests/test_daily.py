@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import daily
+from daily import DailySnapshot
+
+ACTORS = ["Alice Adams", "Bob Brown", "Carol Chen"]
+
+
+class FlakyLookup:
+    """Actor lookup that fails (no id) until `fixed` is set."""
+
+    def __init__(self):
+        self.fixed = False
+        self.calls = 0
+
+    def __call__(self, name):
+        self.calls += 1
+        return {"name": name, "id": len(name) if self.fixed else None, "image": None}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(daily.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_complete_snapshot_is_kept_and_saved(tmp_path):
+    lookup = FlakyLookup()
+    lookup.fixed = True
+    snapshot = DailySnapshot(ACTORS, lookup, path=str(tmp_path / "daily.json"))
+
+    date, body, etag, complete = snapshot.get()
+    assert complete and snapshot.ready
+    assert snapshot.get() == (date, body, etag, complete)
+    assert lookup.calls == 2
+    assert json.load(open(tmp_path / "daily.json"))["date"] == date
+
+
+def test_failed_lookup_is_retried_not_pinned(tmp_path, clock):
+    lookup = FlakyLookup()
+    snapshot = DailySnapshot(ACTORS, lookup, path=str(tmp_path / "daily.json"), retry_interval=30)
+
+    _, body, _, complete = snapshot.get()
+    assert not complete and not snapshot.ready
+    assert json.loads(body)["start"]["id"] is None
+    assert not (tmp_path / "daily.json").exists()
+
+    # Served as is until the retry interval passes
+    lookup.fixed = True
+    clock[0] += 10
+    assert snapshot.get()[3] is False
+    assert lookup.calls == 2
+
+    clock[0] += 30
+    _, body, _, complete = snapshot.get()
+    assert complete and snapshot.ready
+    assert json.loads(body)["start"]["id"] is not None
+    assert (tmp_path / "daily.json").exists()
@@ -0,0 +1,148 @@
+import json
+import os
+import random
+from collections import deque
+
+import pytest
+
+from graph import CoStarGraph, build
+from tmdb import RecordedClient
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "tmdb_small.json")
+NAMES = ["Alice Adams", "Bob Brown", "Carol Chen", "Dan Diaz", "Eve Evans"]
+
+
+@pytest.fixture
+def graph():
+    return build(RecordedClient.from_file(FIXTURE), NAMES)
+
+
+def bfs(graph, src):
+    dist = {src: 0}
+    queue = deque([src])
+    while queue:
+        u = queue.popleft()
+        for v in graph.neighbors(u):
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                queue.append(v)
+    return dist
+
+
+def test_build_from_recorded_fixture(graph):
+    assert sorted(a[1] for a in graph.actors) == sorted(NAMES + ["Frank Fox"])
+    # Talk Night is a talk show, so it's left out and Eve stays unlinked
+    assert sorted(t[2] for t in graph.titles) == ["Alpha", "Beta", "Delta", "Gamma Show", "Solo"]
+    assert len(graph) == 10
+
+
+def test_build_keeps_images_and_popularity(graph):
+    alice = graph.actors[graph.actor_index("Alice Adams")]
+    frank = graph.actors[graph.actor_index("Frank Fox")]
+    assert alice[2:] == ("/p1.jpg", 9.0)
+    assert frank[2] == "/p6.jpg"
+    assert ("movie", 10, "Alpha", 90.0, "/t10.jpg") in graph.titles
+
+
+def test_load_pads_graphs_saved_without_images(graph, tmp_path):
+    path = str(tmp_path / "old.json")
+    graph.save(path)
+    with open(path) as f:
+        data = json.load(f)
+    data["actors"] = [a[:2] for a in data["actors"]]
+    data["titles"] = [t[:4] for t in data["titles"]]
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+    loaded = CoStarGraph.load(path)
+    assert loaded.actors[0] == graph.actors[0][:2] + (None, 0)
+    assert loaded.titles[0] == graph.titles[0][:4] + (None,)
+    assert loaded.next_links("Alice Adams", "Dan Diaz") == graph.next_links("Alice Adams", "Dan Diaz")
+
+
+def test_curated_spellings_find_the_tmdb_actor(tmp_path):
+    with open(FIXTURE) as f:
+        responses = json.load(f)
+    # TMDB's search forgives the typos and returns the real names
+    responses["search/person?query=Alise+Adams"] = responses["search/person?query=Alice+Adams"]
+    responses["search/person?query=Frankie+Fox"] = {"results": [{"id": 6, "name": "Frank Fox"}]}
+    names = ["Alise Adams", "Bob Brown", "Carol Chen", "Dan Diaz", "Frankie Fox"]
+    graph = build(RecordedClient(responses), names)
+
+    # Curated name seen first, and seen only after the actor was added as a co-star
+    assert graph.actors[graph.actor_index("Alise Adams")][1] == "Alice Adams"
+    assert graph.actor_index("Alise Adams") == graph.actor_index("Alice Adams")
+    assert graph.actor_index("Frankie Fox") == graph.actor_index("Frank Fox")
+    assert graph.next_links("Alise Adams", "Dan Diaz")[0] == 2
+    assert graph.next_links("Frankie Fox", "Alise Adams") == (1, [("Alpha", ["Alice Adams"])])
+
+    path = str(tmp_path / "graph.json")
+    graph.save(path)
+    assert CoStarGraph.load(path).next_links("Frankie Fox", "Dan Diaz") == graph.next_links("Frankie Fox", "Dan Diaz")
+
+
+def test_next_links_lists_every_shortest_first_hop(graph):
+    steps, links = graph.next_links("Alice Adams", "Dan Diaz")
+    assert steps == 2
+    # Most popular title first
+    assert links == [("Alpha", ["Bob Brown"]), ("Beta", ["Carol Chen"])]
+
+
+def test_next_links_direct_costars(graph):
+    assert graph.next_links("alice adams", "FRANK FOX") == (1, [("Alpha", ["Frank Fox"])])
+
+
+def test_next_links_unlinked_or_unknown(graph):
+    assert graph.next_links("Alice Adams", "Eve Evans") == (None, [])
+    assert graph.next_links("Alice Adams", "Nobody") == (None, [])
+
+
+def test_next_links_same_actor(graph):
+    assert graph.next_links("Bob Brown", "Bob Brown") == (0, [])
+
+
+def test_shortest_path_nodes_marks_both_paths(graph):
+    alice, dan = graph.actor_index("Alice Adams"), graph.actor_index("Dan Diaz")
+    length, depth, on_path = graph.shortest_path_nodes(alice, dan)
+    assert length == 4
+    assert {graph.node_name(v) for v in on_path} == {
+        "Alice Adams", "Alpha", "Bob Brown", "Gamma Show", "Beta", "Carol Chen", "Delta", "Dan Diaz",
+    }
+    assert all(depth[v] == bfs(graph, alice)[v] for v in on_path)
+
+
+def test_save_load_round_trip(graph, tmp_path):
+    path = str(tmp_path / "graph.json")
+    graph.save(path)
+    loaded = CoStarGraph.load(path)
+    assert loaded.actors == graph.actors
+    assert loaded.titles == graph.titles
+    assert list(loaded.offsets) == list(graph.offsets)
+    assert list(loaded.edges) == list(graph.edges)
+    assert loaded.next_links("Alice Adams", "Dan Diaz") == graph.next_links("Alice Adams", "Dan Diaz")
+
+
+def test_from_edges_drops_duplicate_pairs():
+    graph = CoStarGraph.from_edges([(1, "A"), (2, "B")], [("movie", 1, "T", 1.0)], [(0, 0), (0, 0), (1, 0)])
+    assert len(graph) == 2
+    assert list(graph.neighbors(2)) == [0, 1]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_bidirectional_bfs_matches_plain_bfs(seed):
+    rng = random.Random(seed)
+    n_actors, n_titles = rng.randint(2, 30), rng.randint(1, 30)
+    pairs = [(rng.randrange(n_actors), rng.randrange(n_titles)) for _ in range(rng.randint(1, 60))]
+    graph = CoStarGraph.from_edges(
+        [(i, f"A{i}") for i in range(n_actors)], [("movie", i, f"T{i}", 0) for i in range(n_titles)], pairs,
+    )
+    src, dst = rng.randrange(n_actors), rng.randrange(n_actors)
+    from_src, from_dst = bfs(graph, src), bfs(graph, dst)
+
+    length, depth, on_path = graph.shortest_path_nodes(src, dst)
+    if dst not in from_src:
+        assert (length, depth, on_path) == (None, {}, set())
+        return
+    assert length == from_src[dst]
+    assert on_path == {v for v in from_src if v in from_dst and from_src[v] + from_dst[v] == length}
+    assert depth == {v: from_src[v] for v in on_path}
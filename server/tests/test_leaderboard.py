@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+
+import leaderboard
+from bench import FakeDatabase
+from leaderboard import FirebaseStore, JsonFileStore, Leaderboard, merge_top
+
+DAY = "2025-01-01"
+
+
+@pytest.fixture(autouse=True)
+def fixed_day(monkeypatch):
+    monkeypatch.setattr(leaderboard, "pacific_today", lambda: DAY)
+
+
+def entry(player, steps, duration=0):
+    return {"player": player, "steps": steps, "duration": duration}
+
+
+class ScriptedStore:
+    """Store whose merge() results and timing are controlled by the test."""
+
+    name = "scripted"
+
+    def __init__(self, entries=()):
+        self.entries = list(entries)
+        self.merges = []
+        self.load_gate = None
+
+    def load(self, day):
+        if self.load_gate is not None:
+            self.load_gate.wait(5)
+        return list(self.entries)
+
+    def merge(self, day, entries, size):
+        self.merges.append(entries)
+        self.entries = merge_top(self.entries, entries, size)
+        return list(self.entries)
+
+
+def test_top_keeps_best_scores_in_order():
+    board = Leaderboard(FirebaseStore(database=FakeDatabase()), size=3, refresh_interval=float("inf"))
+    for player, steps, duration in [("a", 5, 10), ("b", 3, 30), ("c", 3, 20), ("d", 7, 0), ("e", 4, 0)]:
+        board.submit(player, steps, duration)
+    assert [e["player"] for e in board.top()] == ["c", "b", "e"]
+
+
+def test_scores_that_cannot_place_never_reach_the_store():
+    store = ScriptedStore([entry("a", 2), entry("b", 3)])
+    board = Leaderboard(store, size=2, refresh_interval=float("inf"))
+
+    assert board.submit("slow", 4) is False
+    assert board.submit("tie", 3) is False
+    assert store.merges == []
+    assert board.submit("fast", 1) is True
+    assert [e["player"] for e in board.top()] == ["fast", "a"]
+
+
+def test_workers_sharing_a_database_merge_through_transactions():
+    database = FakeDatabase()
+    first = Leaderboard(FirebaseStore(database=database), size=5, refresh_interval=float("inf"))
+    second = Leaderboard(FirebaseStore(database=database), size=5, refresh_interval=float("inf"))
+
+    first.submit("a", 4)
+    second.submit("b", 3)
+    first.submit("c", 5)
+
+    stored = database.data[f"leaderboards/{DAY}"]
+    assert [e["player"] for e in stored] == ["b", "a", "c"]
+    assert [e["player"] for e in first.top()] == ["b", "a", "c"]
+
+
+def test_json_file_store_merges_across_instances(tmp_path):
+    path = str(tmp_path / "board.json")
+    JsonFileStore(path).merge(DAY, [entry("a", 4)], 5)
+    JsonFileStore(path).merge(DAY, [entry("b", 2)], 5)
+    assert [e["player"] for e in JsonFileStore(path).load(DAY)] == ["b", "a"]
+
+
+def test_slow_older_merge_does_not_overwrite_newer_result():
+    store = ScriptedStore()
+    gate = threading.Event()
+    merge = store.merge
+
+    def slow_merge(day, entries, size):
+        result = merge(day, entries, size)
+        if entries[0]["player"] == "slow":
+            gate.wait(5)  # commits first, answers last
+        return result
+
+    store.merge = slow_merge
+    board = Leaderboard(store, size=5, refresh_interval=float("inf"))
+    board.top()
+
+    slow = threading.Thread(target=board.submit, args=("slow", 4))
+    slow.start()
+    while not store.merges:
+        time.sleep(0.001)
+    board.submit("fast", 3)
+    gate.set()
+    slow.join()
+
+    assert [e["player"] for e in board.top()] == ["fast", "slow"]
+
+
+def test_late_result_for_yesterday_does_not_replace_today(monkeypatch):
+    today = [DAY]
+    monkeypatch.setattr(leaderboard, "pacific_today", lambda: today[0])
+    store = ScriptedStore()
+    started, gate = threading.Event(), threading.Event()
+    merge = store.merge
+
+    def slow_merge(day, entries, size):
+        if day == DAY:
+            started.set()
+            gate.wait(5)
+            return [entry("yesterday", 1)]
+        return merge(day, entries, size)
+
+    store.merge = slow_merge
+    board = Leaderboard(store, size=5, refresh_interval=float("inf"))
+    board.top()
+
+    slow = threading.Thread(target=board.submit, args=("yesterday", 1))
+    slow.start()
+    started.wait(5)
+
+    today[0] = "2025-01-02"
+    board.submit("today", 4)
+    gate.set()
+    slow.join()
+
+    assert board._day == "2025-01-02"
+    assert [item[3]["player"] for item in board._heap] == ["today"]
+    assert [e["player"] for e in board.top()] == ["today"]
+
+
+def test_refresh_does_not_block_other_readers():
+    store = ScriptedStore([entry("a", 3)])
+    board = Leaderboard(store, size=5, refresh_interval=0)
+    assert [e["player"] for e in board.top()] == ["a"]
+
+    store.entries.append(entry("b", 4))
+    store.load_gate = threading.Event()
+    refreshing = threading.Thread(target=board.top)
+    refreshing.start()
+    while not board._loading:
+        time.sleep(0.001)
+
+    # Served from the current heap while the slow load is in flight
+    assert [e["player"] for e in board.top()] == ["a"]
+    store.load_gate.set()
+    refreshing.join()
+    store.load_gate = None
+    board.refresh_interval = float("inf")
+    assert [e["player"] for e in board.top()] == ["a", "b"]
@@ -0,0 +1,54 @@
+from suggest_index import SuggestIndex
+
+
+def test_prefix_matches_any_word_and_ranks_curated_first():
+    index = SuggestIndex()
+    index.seed("actor", [("Tom Hanks", "h.jpg", 50, False), ("Hannah Einbinder", "e.jpg", 10, True),
+                         ("Tom Holland", "o.jpg", 80, False)])
+    assert [s["name"] for s in index.search("actor", "han")] == ["Hannah Einbinder", "Tom Hanks"]
+    assert [s["name"] for s in index.search("actor", "tom h")] == ["Tom Holland", "Tom Hanks"]
+
+
+def test_require_image_skips_entries_without_one():
+    index = SuggestIndex()
+    index.seed("actor", [("Tom Hanks", None, 0, True), ("Tom Holland", "o.jpg", 80, False)])
+    assert [s["name"] for s in index.search("actor", "tom", require_image=True)] == ["Tom Holland"]
+
+    # A later TMDB response fills the missing picture in
+    index.add("actor", "Tom Hanks", "h.jpg", 50)
+    assert index.search("actor", "tom", require_image=True) == [
+        {"name": "Tom Hanks", "image": "h.jpg"}, {"name": "Tom Holland", "image": "o.jpg"},
+    ]
+
+
+def test_harvest_indexes_search_and_credit_responses():
+    index = SuggestIndex()
+    index.harvest("search/multi", {"results": [
+        {"media_type": "movie", "title": "Forrest Gump", "poster_path": "/fg.jpg", "popularity": 80},
+        {"media_type": "person", "name": "Robin Wright", "profile_path": "/rw.jpg", "popularity": 30},
+    ]})
+    index.harvest("movie/13/credits", {"cast": [
+        {"name": f"Cast Member {i}", "profile_path": f"/c{i}.jpg", "popularity": i} for i in range(40)
+    ]})
+    index.harvest("person/31/tv_credits", {"cast": [{"name": "Forrest Show", "poster_path": "/fs.jpg"}]})
+
+    assert [s["name"] for s in index.search("title", "forr")] == ["Forrest Gump", "Forrest Show"]
+    assert index.search("actor", "robin") == [{"name": "Robin Wright", "image": "https://image.tmdb.org/t/p/w185/rw.jpg"}]
+    assert len(index.search("actor", "cast member", limit=50)) == 40
+
+
+def test_recent_keys_are_searchable_before_and_after_folding():
+    index = SuggestIndex(merge_every=8)
+    for i in range(20):
+        index.add("actor", f"Person {i:02d}", f"{i}.jpg", i)
+        assert len(index.search("actor", "person", limit=50)) == i + 1
+    assert len(index._recent["actor"]) < 8
+    assert index._keys["actor"] == sorted(index._keys["actor"])
+    assert [s["name"] for s in index.search("actor", "person 1", limit=3)] == ["Person 19", "Person 18", "Person 17"]
+
+
+def test_harvest_tolerates_null_lists():
+    index = SuggestIndex()
+    index.harvest("search/person", {"results": None})
+    index.harvest("movie/1/credits", {"cast": None})
+    assert len(index) == 0
@@ -0,0 +1,204 @@
+import threading
+import time
+
+from tmdb import REQUEST_THREADS, RecordedClient, ReplayAdapter, TTLCache, TMDBClient
+
+
+def client_with(respond, **kwargs):
+    client = TMDBClient(api_key="test", base_url="http://tmdb.test/3", **kwargs)
+    transport = ReplayAdapter(client.base_url, respond)
+    client.session.mount(client.base_url, transport)
+    return client, transport
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    assert cache.get("a") == (True, 1)
+    now[0] += 6
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_get_caches_ok_responses_only():
+    statuses = iter([429, 200])
+    client, transport = client_with(lambda endpoint, params: (next(statuses), {"endpoint": endpoint}))
+
+    assert client.get("search/person", query="x") == {"endpoint": "search/person"}
+    assert client.get("search/person", query="x") == {"endpoint": "search/person"}
+    assert client.get("search/person", query="x") == {"endpoint": "search/person"}
+    assert transport.calls == 2
+    assert client.stats()["hits"] == 1
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    release = threading.Event()
+
+    def respond(endpoint, params):
+        release.wait(5)
+        return 200, {"id": 1}
+
+    client, transport = client_with(respond)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get("movie/1"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while client.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert transport.calls == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_followers_get_the_leaders_error():
+    release = threading.Event()
+
+    def respond(endpoint, params):
+        release.wait(5)
+        raise ConnectionError("boom")
+
+    client, transport = client_with(respond)
+    errors = []
+
+    def call():
+        try:
+            client.get("movie/1")
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while client.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert transport.calls == 1
+    assert len(errors) == 4
+    assert client.stats()["inflight"] == 0
+
+
+def test_miss_after_leader_finished_uses_the_cache():
+    client, transport = client_with(lambda endpoint, params: (200, {"fresh": True}))
+    key = ("movie/1", ())
+    client.cache.set(key, {"cached": True})
+
+    # Simulate losing the race: the first cache check misses, then the leader stores and leaves
+    real_get = client.cache.get
+    calls = []
+
+    def racy_get(k):
+        calls.append(k)
+        return (False, None) if len(calls) == 1 else real_get(k)
+
+    client.cache.get = racy_get
+    assert client.get("movie/1") == {"cached": True}
+    assert transport.calls == 0
+
+
+def test_get_many_keeps_order_and_drops_failures():
+    def respond(endpoint, params):
+        if endpoint == "movie/2":
+            raise ConnectionError("boom")
+        return 200, {"endpoint": endpoint}
+
+    client, _ = client_with(respond)
+    results = client.get_many([("movie/1", {}), ("movie/2", {}), ("movie/3", {})])
+    assert results == [{"endpoint": "movie/1"}, None, {"endpoint": "movie/3"}]
+
+
+def test_recorded_client_replays_fixture_keys():
+    client = RecordedClient({"search/person?query=Tom+Hanks": {"results": [{"id": 31}]}})
+    assert client.get("search/person", query="Tom Hanks") == {"results": [{"id": 31}]}
+    assert client.get("search/person", query="Nobody")["success"] is False
+
+
+def test_get_many_holds_at_most_per_call_pool_threads():
+    lock = threading.Lock()
+    running = [0, 0]  # now, max
+
+    def respond(endpoint, params):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.005)
+        with lock:
+            running[0] -= 1
+        return 200, {"endpoint": endpoint}
+
+    client, transport = client_with(respond, concurrency=8, per_call=3)
+    results = client.get_many([(f"movie/{i}", {}) for i in range(20)])
+    assert results == [{"endpoint": f"movie/{i}"} for i in range(20)]
+    assert running[1] <= 3
+    assert transport.calls == 20
+
+
+def test_get_many_stops_submitting_at_the_deadline():
+    def respond(endpoint, params):
+        time.sleep(0.05)
+        return 200, {"endpoint": endpoint}
+
+    client, transport = client_with(respond, concurrency=4, per_call=2)
+    results = client.get_many([(f"movie/{i}", {}) for i in range(10)], deadline=time.monotonic() + 0.075)
+    assert results[:2] == [{"endpoint": "movie/0"}, {"endpoint": "movie/1"}]
+    assert results[4:] == [None] * 6
+    time.sleep(0.1)
+    assert transport.calls <= 4
+
+
+def test_failing_observer_does_not_fail_the_request():
+    client, transport = client_with(lambda endpoint, params: (200, {"results": None}))
+    seen = []
+
+    def broken(endpoint, data):
+        raise TypeError("bad payload")
+
+    client.observers += [broken, lambda endpoint, data: seen.append(endpoint)]
+    assert client.get("search/person", query="x") == {"results": None}
+    assert client.get("search/person", query="x") == {"results": None}
+    assert transport.calls == 1
+    assert seen == ["search/person"]
+
+
+def test_pool_has_a_connection_for_every_calling_thread(caplog):
+    import stub_tmdb
+
+    server = stub_tmdb.serve(stub_tmdb.World(["A A", "B B", "C C"], extras=100, titles=400), latency=0.05)
+    try:
+        client = TMDBClient(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}", concurrency=16)
+        assert client.pool_size == 16 + REQUEST_THREADS
+
+        # Half the request threads fan out through the pool, half call get() directly
+        def request(n):
+            if n % 2:
+                client.get_many([(f"movie/{t}/credits", {}) for t in range(n * 20 + 1, n * 20 + 21)])
+            else:
+                for k in range(5):
+                    client.get("search/person", query=f"Extra Person {n * 5 + k}")
+
+        threads = [threading.Thread(target=request, args=(n,)) for n in range(REQUEST_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+    assert "Connection pool is full" not in caplog.text
@@ -0,0 +1,126 @@
+import pytest
+
+from names import normalize
+from tmdb import RecordedClient
+from validation import LOOSE_MAX_CANDIDATES, LinkValidator
+
+
+def credit(kind, content_id, name, popularity=1.0):
+    key = "title" if kind == "movie" else "name"
+    return {"id": content_id, key: name, "poster_path": f"/t{content_id}.jpg", "popularity": popularity}
+
+
+def cast(*names):
+    return {"cast": [{"id": n, "name": name, "profile_path": f"/p{n}.jpg"} for n, name in enumerate(names, start=100)]}
+
+
+RESPONSES = {
+    "search/person?query=Tom+Hanks": {"results": [
+        {"id": 99, "name": "Tom Hanks Jr"},
+        {"id": 31, "name": "Tom Hanks"},
+    ]},
+    "person/31/movie_credits": {"cast": [
+        credit("movie", 1, "The Avengers", 50),
+        credit("movie", 2, "Avengers: Endgame", 90),
+        credit("movie", 3, "Alpha", 10),
+        credit("movie", 4, "Alpha Two", 80),
+    ] + [credit("movie", 10 + n, f"Night {n}", n) for n in range(10)]},
+    "person/31/tv_credits": {"cast": [credit("tv", 7, "Long Show", 5)]},
+    "movie/1/credits": cast("Robin Wright"),
+    "movie/2/credits": cast("Gary Sinise"),
+    "movie/3/credits": cast("Sally Field"),
+    "movie/4/credits": cast("Mykelti Williamson"),
+    # Only the aggregate credits list actors from earlier seasons
+    "tv/7/credits": cast("Newcomer"),
+    "tv/7/aggregate_credits": cast("Newcomer", "First Season Star"),
+    **{f"movie/{10 + n}/credits": cast(f"Night Actor {n}") for n in range(10)},
+}
+
+
+@pytest.fixture
+def client():
+    return RecordedClient(dict(RESPONSES))
+
+
+@pytest.fixture
+def validator(client):
+    return LinkValidator(client)
+
+
+def test_prefers_the_exact_name_over_tmdbs_first_result(validator):
+    assert validator._actor_id("Tom Hanks") == 31
+    assert "alpha" in validator.filmography("Tom Hanks")
+
+
+def test_exact_title_wins_over_loose_matches(validator):
+    titles = validator.filmography("Tom Hanks")
+    assert [c["id"] for c in validator.resolve_title(titles, "alpha")] == [3]
+    assert validator.validate("Tom Hanks", "Alpha", "Sally Field")["valid"] is True
+    # Mykelti is in "Alpha Two", which only a loose match would reach
+    assert validator.validate("Tom Hanks", "Alpha", "Mykelti Williamson") == {"valid": False}
+
+
+def test_loose_match_is_whole_words_closest_first(validator):
+    titles = validator.filmography("Tom Hanks")
+    assert [c["id"] for c in validator.resolve_title(titles, "avengers")] == [1, 2]
+    assert validator.resolve_title(titles, "aven") == []
+    assert validator.validate("Tom Hanks", "Avengers", "Gary Sinise")["valid"] is True
+
+
+def test_loose_match_ignores_short_guesses_and_caps_candidates(validator, client):
+    titles = validator.filmography("Tom Hanks")
+    calls = client.transport.calls
+    assert validator.validate("Tom Hanks", "a", "Nobody") == {"valid": False}
+    assert validator.validate("Tom Hanks", "the", "Nobody") == {"valid": False}
+    assert client.transport.calls == calls
+
+    night = validator.resolve_title(titles, "night")
+    assert len(night) == LOOSE_MAX_CANDIDATES
+    assert [c["id"] for c in night] == [19, 18, 17, 16, 15]
+    validator.validate("Tom Hanks", "night", "Nobody")
+    assert client.transport.calls == calls + LOOSE_MAX_CANDIDATES
+
+
+def test_tv_titles_use_aggregate_credits(validator):
+    result = validator.validate("Tom Hanks", "Long Show", "First Season Star")
+    assert result == {
+        "valid": True,
+        "actor_image": "https://image.tmdb.org/t/p/w185/p101.jpg",
+        "poster": "https://image.tmdb.org/t/p/w185/t7.jpg",
+    }
+
+
+def test_only_valid_verdicts_are_cached(validator):
+    valid = (normalize("Tom Hanks"), normalize("Alpha"), normalize("Sally Field"))
+    invalid = (normalize("Tom Hanks"), normalize("Alpha"), normalize("Gary Sinise"))
+    validator.validate("Tom Hanks", "Alpha", "Sally Field")
+    validator.validate("Tom Hanks", "Alpha", "Gary Sinise")
+    assert validator._verdicts.get(valid)[0] is True
+    assert validator._verdicts.get(invalid) == (False, None)
+
+
+def test_filmography_with_a_missing_page_is_not_cached():
+    responses = dict(RESPONSES)
+    del responses["person/31/tv_credits"]
+    validator = LinkValidator(RecordedClient(responses))
+
+    titles = validator.filmography("Tom Hanks")
+    assert "alpha" in titles and "long show" not in titles
+    assert validator._filmographies.get("tom hanks") == (False, None)
+
+
+def test_failed_cast_page_is_not_cached(client):
+    def broken(endpoint, params):
+        if endpoint == "movie/3/credits":
+            raise ConnectionError("boom")
+        return respond(endpoint, params)
+
+    respond = client.transport.respond
+    client.transport.respond = broken
+    validator = LinkValidator(client)
+    assert validator.validate("Tom Hanks", "Alpha", "Sally Field") == {"valid": False}
+    assert validator._casts.get(("movie", 3)) == (False, None)
+
+    client.transport.respond = respond
+    assert validator.validate("Tom Hanks", "Alpha", "Sally Field")["valid"] is True
+    assert validator._casts.get(("movie", 3))[0] is True
@@ -0,0 +1,324 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+import metrics
+
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w185"
+
+# Request threads per worker (see gunicorn.conf.py); they call get() directly
+REQUEST_THREADS = int(os.getenv("GUNICORN_THREADS", 16))
+
+
+def image_url(path):
+    return f"{IMAGE_BASE_URL}{path}" if path else None
+
+
+class TTLCache:
+    """LRU cache whose entries also expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize=4096, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TMDBClient:
+    """Shared TMDB client: pooled session, response cache and single-flight.
+
+    Responses are cached by (endpoint, params) and handed to every caller as
+    the same object, so callers must treat them as read-only.
+    """
+
+    def __init__(self, api_key=None, base_url=TMDB_BASE_URL, pool_size=None,
+                 cache_size=4096, cache_ttl=3600, timeout=10, concurrency=16, per_call=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = TTLCache(cache_size, cache_ttl)
+
+        # One connection per thread that can be mid-request: the get_many() pool
+        # plus every request thread. With fewer, urllib3 discards the extra
+        # connections when they're returned and has to reopen them (TLS and all).
+        self.pool_size = pool_size or concurrency + REQUEST_THREADS
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tmdb")
+        # Most pool threads one get_many() may hold, so a big batch can't starve the rest
+        self.per_call = per_call or max(1, concurrency // 2)
+
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.observers = []  # called as fn(endpoint, data) for each fresh response
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+
+    def get(self, endpoint, **params):
+        key = (endpoint, tuple(sorted(params.items())))
+        hit, value = self.cache.get(key)
+        if hit:
+            self._hit(endpoint)
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                # A leader may have stored the value and left since we checked
+                hit, value = self.cache.get(key)
+                if not hit:
+                    flight = self._inflight[key] = _Flight()
+                    self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if hit:
+            self._hit(endpoint)
+            return value
+
+        if not leader:
+            started = time.perf_counter()
+            flight.done.wait()
+            status = "error" if flight.error is not None else "ok"
+            metrics.record("tmdb", endpoint, time.perf_counter() - started, status, "coalesced")
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch(endpoint, params, key)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def get_many(self, lookups, deadline=None):
+        """Fetch [(endpoint, params), ...] concurrently on the shared pool.
+
+        At most `per_call` of the lookups are in the pool at once. Returns
+        responses in the same order as `lookups`. Entries that failed or were
+        not back by `deadline` (a time.monotonic() value) are None; stragglers
+        already running still land in the cache for next time.
+        """
+        results = [None] * len(lookups)
+        queued = deque()
+        for i, (endpoint, params) in enumerate(lookups):
+            hit, value = self.cache.get((endpoint, tuple(sorted(params.items()))))
+            if hit:
+                self._hit(endpoint)
+                results[i] = value
+            else:
+                queued.append(i)
+
+        pending = {}
+        while queued or pending:
+            while queued and len(pending) < self.per_call:
+                i = queued.popleft()
+                endpoint, params = lookups[i]
+                # Run in a copy of our context so the calls land in this request's trace
+                context = contextvars.copy_context()
+                pending[self.executor.submit(context.run, self.get, endpoint, **params)] = i
+
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                if future.exception() is None:
+                    results[i] = future.result()
+            if not done or (deadline is not None and time.monotonic() >= deadline):
+                break
+
+        for future in pending:
+            future.cancel()
+        return results
+
+    def _hit(self, endpoint):
+        with self._lock:
+            self.hits += 1
+        metrics.record("tmdb", endpoint, 0.0, "ok", "hit")
+
+    def _fetch(self, endpoint, params, key):
+        with self._lock:
+            self.upstream_calls += 1
+        started = time.perf_counter()
+        try:
+            res = self.session.get(
+                f"{self.base_url}/{endpoint}",
+                params={**params, "api_key": self.api_key or os.getenv("TMDB_API_KEY")},
+                timeout=self.timeout,
+            )
+        except Exception:
+            metrics.record("tmdb", endpoint, time.perf_counter() - started, "error", "miss")
+            raise
+        metrics.record("tmdb", endpoint, time.perf_counter() - started, str(res.status_code), "miss")
+        data = res.json()
+        # Error payloads (404, 429...) are passed through but never cached
+        if res.ok:
+            self._store(key, endpoint, data)
+        return data
+
+    def _store(self, key, endpoint, data):
+        self.cache.set(key, data)
+        for observer in self.observers:
+            # The response is fine either way; an indexing bug mustn't fail the request
+            try:
+                observer(endpoint, data)
+            except Exception as e:
+                name = getattr(observer, "__qualname__", observer)
+                print(f"⚠️  TMDB observer {name} failed on {endpoint}: {e}", file=sys.stderr)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "upstream_calls": self.upstream_calls,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "cache_size": len(self.cache),
+                "inflight": len(self._inflight),
+            }
+
+
+def fixture_key(endpoint, params):
+    query = urlencode(sorted(params.items()))
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+NOT_FOUND = {"success": False, "status_code": 34, "status_message": "The resource you requested could not be found."}
+
+
+def split_url(base_path, url):
+    """(endpoint, params) for a request URL under `base_path`, minus the api_key."""
+    parsed = urlparse(url)
+    endpoint = parsed.path[len(base_path):].lstrip("/")
+    return endpoint, {k: v[0] for k, v in parse_qs(parsed.query).items() if k != "api_key"}
+
+
+def replay(responses):
+    """ReplayAdapter responder backed by a {fixture_key: body} dict."""
+    def respond(endpoint, params):
+        body = responses.get(fixture_key(endpoint, params))
+        return (200, body) if body is not None else (404, NOT_FOUND)
+    return respond
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport that answers TMDB calls locally.
+
+    `respond(endpoint, params)` returns (status, body). Mounted on a client's
+    session it replaces the network while keeping the rest of the client
+    (pooling, cache, single-flight) exactly as in production.
+    """
+
+    def __init__(self, base_url, respond, latency=0.0):
+        super().__init__()
+        self.base_path = urlparse(base_url).path.rstrip("/")
+        self.respond = respond
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        endpoint, params = split_url(self.base_path, request.url)
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        status, body = self.respond(endpoint, params)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordedClient(TMDBClient):
+    """TMDBClient that replays recorded responses instead of calling TMDB.
+
+    `responses` maps fixture_key(endpoint, params) to the JSON body; anything
+    not recorded comes back as TMDB's "resource not found" payload.
+    """
+
+    def __init__(self, responses, latency=0.0, **kwargs):
+        super().__init__(api_key="recorded", base_url="http://tmdb.recorded/3", **kwargs)
+        self.transport = ReplayAdapter(self.base_url, replay(responses), latency)
+        self.session.mount(self.base_url, self.transport)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path) as f:
+            data = json.load(f)
+        # Benchmark fixtures wrap the responses next to their scenarios
+        return cls(data.get("responses", data), **kwargs)
+
+
+client = TMDBClient(
+    api_key=os.getenv("TMDB_API_KEY"),
+    pool_size=int(os.getenv("TMDB_POOL_SIZE", 0)) or None,
+    cache_size=int(os.getenv("TMDB_CACHE_SIZE", 4096)),
+    cache_ttl=int(os.getenv("TMDB_CACHE_TTL", 3600)),
+    concurrency=int(os.getenv("TMDB_CONCURRENCY", 16)),
+    per_call=int(os.getenv("TMDB_PER_CALL", 0)) or None,
+)
@@ -0,0 +1,138 @@
+from names import normalize
+from tmdb import TTLCache, image_url
+
+# Loose title matching ("Avengers" -> "The Avengers") is whole words only, needs
+# a guess at least this long and checks this many candidate titles at most
+LOOSE_MIN_LENGTH = 4
+LOOSE_MAX_CANDIDATES = 5
+
+
+class LinkValidator:
+    """Answers "was `next_actor` in `title` with `actor`?" from indexed caches.
+
+    Three layers, each reused across players:
+      * per actor: TMDB id plus an index of normalized title -> credits
+      * per content id: normalized cast names -> (person id, profile path)
+      * per (actor, title, next_actor): the verdict, once it's been confirmed
+
+    Nothing built from a failed or partial TMDB response is cached.
+    """
+
+    def __init__(self, client, size=2048, ttl=6 * 3600):
+        self.client = client
+        self._filmographies = TTLCache(size, ttl)
+        self._casts = TTLCache(size * 4, ttl)
+        self._verdicts = TTLCache(size * 8, ttl)
+
+    def validate(self, actor, title, next_actor):
+        key = (normalize(actor), normalize(title), normalize(next_actor))
+        if not all(key):
+            return {"valid": False}
+
+        hit, verdict = self._verdicts.get(key)
+        if not hit:
+            verdict = self._check(actor, key[1], key[2])
+            if verdict["valid"]:
+                self._verdicts.set(key, verdict)
+        return verdict
+
+    def _check(self, actor, title, next_actor):
+        titles = self.filmography(actor)
+        credits = self.resolve_title(titles, title)
+        for credit, members in zip(credits, self.casts(credits)):
+            member = members.get(next_actor)
+            if member:
+                return {
+                    "valid": True,
+                    "actor_image": image_url(member[1]),
+                    "poster": image_url(credit.get("poster_path")),
+                }
+        return {"valid": False}
+
+    def filmography(self, actor):
+        """Normalized title -> [credit, ...] for an actor."""
+        hit, titles = self._filmographies.get(normalize(actor))
+        if hit:
+            return titles
+
+        titles = {}
+        actor_id = self._actor_id(actor)
+        if not actor_id:
+            return titles
+
+        pages = self.client.get_many([
+            (f"person/{actor_id}/movie_credits", {}),
+            (f"person/{actor_id}/tv_credits", {}),
+        ])
+        for kind, page in zip(("movie", "tv"), pages):
+            for credit in (page or {}).get("cast", []):
+                name = normalize(credit.get("title") or credit.get("name"))
+                if name:
+                    titles.setdefault(name, []).append({
+                        "kind": kind,
+                        "id": credit["id"],
+                        "poster_path": credit.get("poster_path"),
+                        "popularity": credit.get("popularity", 0),
+                    })
+        for credits in titles.values():
+            credits.sort(key=lambda c: c["popularity"], reverse=True)
+
+        if all(page and "cast" in page for page in pages):
+            self._filmographies.set(normalize(actor), titles)
+        return titles
+
+    def _actor_id(self, actor):
+        results = self.client.get("search/person", query=actor).get("results") or []
+        # Prefer an exact name match over TMDB's relevance order
+        for person in results:
+            if normalize(person.get("name")) == normalize(actor):
+                return person["id"]
+        return results[0]["id"] if results else None
+
+    @staticmethod
+    def resolve_title(titles, title):
+        if title in titles:
+            return titles[title]
+        # Loose match like "Avengers" -> "The Avengers" only when there's no exact hit;
+        # closest in length first, then most popular
+        if len(title) < LOOSE_MIN_LENGTH:
+            return []
+        padded = f" {title} "
+        matches = [
+            (abs(len(name) - len(title)), -credit["popularity"], credit)
+            for name, credits in titles.items()
+            if len(name) >= LOOSE_MIN_LENGTH and (padded in f" {name} " or f" {name} " in padded)
+            for credit in credits
+        ]
+        matches.sort(key=lambda m: m[:2])
+        return [credit for _, _, credit in matches[:LOOSE_MAX_CANDIDATES]]
+
+    def cast(self, kind, content_id):
+        """Normalized cast name -> (person id, profile path) for one title."""
+        return self.casts([{"kind": kind, "id": content_id}])[0]
+
+    def casts(self, credits):
+        """cast() for several titles, fetching the uncached ones concurrently."""
+        results, missing = [], []
+        for credit in credits:
+            hit, members = self._casts.get((credit["kind"], credit["id"]))
+            if not hit:
+                missing.append(len(results))
+            results.append(members)
+
+        # TV credits only list the latest season; aggregate covers the whole run
+        pages = self.client.get_many([
+            (f"tv/{credits[i]['id']}/aggregate_credits" if credits[i]["kind"] == "tv"
+             else f"movie/{credits[i]['id']}/credits", {})
+            for i in missing
+        ])
+        for i, page in zip(missing, pages):
+            members = {}
+            for person in (page or {}).get("cast", []):
+                name = normalize(person.get("name") or person.get("original_name"))
+                if name:
+                    members.setdefault(name, (person.get("id"), person.get("profile_path")))
+            if page and "cast" in page:
+                self._casts.set((credits[i]["kind"], credits[i]["id"]), members)
+            results[i] = members
+        return results